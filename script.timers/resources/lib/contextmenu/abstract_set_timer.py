@@ -6,7 +6,6 @@ import xbmcaddon
 import xbmcgui
 from resources.lib.contextmenu import pvr_utils
 from resources.lib.player.mediatype import SCRIPT, VIDEO
-from resources.lib.timer.concurrency import determine_overlappings
 from resources.lib.timer.storage import Storage
 from resources.lib.timer.timer import (END_TYPE_DURATION, END_TYPE_NO,
                                        END_TYPE_TIME, FADE_OFF,
@@ -109,6 +108,9 @@ class AbstractSetTimer:
             timer.vol_min = vol_min
             timer.vol_max = vol_max
 
+        # not needed unless all questions have been answered
+        from resources.lib.timer.concurrency import determine_overlappings
+
         timer.init()
         now = datetime.today()
         timer.to_timer_by_date(base=now)
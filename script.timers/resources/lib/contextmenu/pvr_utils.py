@@ -1,8 +1,8 @@
+import json
 from urllib import parse
 
 import xbmc
-from resources.lib.utils.jsonrpc_utils import json_rpc
-from resources.lib.utils.system_utils import get_kodi_version
+import xbmcgui
 
 PVR_TV = "tv"
 PVR_RADIO = "radio"
@@ -15,6 +15,13 @@ _PLAY_PVR_URL_PATTERN_V21 = "pvr://channels/%s/%s@%i/%i@%s_%i.pvr"
 
 _CHANNEL_GROUP_ALL_ID = -1
 
+# index of channel paths by channel number, kept in a window property
+# since every context menu invocation runs in a new interpreter
+_WINDOW_HOME = 10000
+_CHANNEL_INDEX_PROPERTY = "script.timers.pvr_channels.%s"
+
+_channel_index: 'dict[str, dict]' = dict()
+
 
 def get_current_epg_view() -> str:
 
@@ -28,33 +35,80 @@ def get_current_epg_view() -> str:
         return None
 
 
-def get_pvr_channel_path(type: str, channelno: str) -> str:
+def _load_channel_index(type: str) -> dict:
+
+    if type in _channel_index:
+        return _channel_index[type]
 
     try:
-        channelno = int(channelno)
-        _result = json_rpc("PVR.GetChannelGroups", {
-            "channeltype": type})
-        channelGroupAll = _result["channelgroups"][0]["label"]
+        index = json.loads(xbmcgui.Window(_WINDOW_HOME).getProperty(
+            _CHANNEL_INDEX_PROPERTY % type))
+    except ValueError:
+        index = None
+
+    _channel_index[type] = index
+    return index
+
+
+def _save_channel_index(type: str, index: dict) -> None:
+
+    _channel_index[type] = index
+    xbmcgui.Window(_WINDOW_HOME).setProperty(
+        _CHANNEL_INDEX_PROPERTY % type, json.dumps(index))
+
+
+def _build_channel_index(type: str, groups: dict, clients: dict, channels: dict) -> dict:
 
-        _result = json_rpc("PVR.GetClients")
-        pvrClients = _result["clients"]
+    from resources.lib.utils.system_utils import get_kodi_version
 
-        _result = json_rpc("PVR.GetChannels", {
-            "channelgroupid": "all%s" % type, "properties": ["uniqueid", "clientid", "channelnumber"]})
-        channels = [c for c in _result["channels"]
-                    if c["channelnumber"] == channelno]
+    channelGroupAll = groups["channelgroups"][0]["label"]
+    pvrClients = {c["clientid"]: c for c in clients["clients"]
+                  if c["supportsepg"] == True}
+    v21 = get_kodi_version() >= 21.0
 
-        if not channels:
-            return None
+    # the first channel with a number wins, JSON only allows keys of type string
+    paths: 'dict[str, str]' = dict()
+    for channel in channels["channels"]:
+        channelno = str(channel["channelnumber"])
+        if channelno in paths:
+            continue
 
-        pvrClient = [_c for _c in pvrClients if _c["supportsepg"]
-                     == True and _c["clientid"] == channels[0]["clientid"]][0]
+        pvrClient = pvrClients.get(channel["clientid"])
+        if not channelGroupAll or not pvrClient:
+            paths[channelno] = None
+
+        elif not v21:
+            paths[channelno] = _PLAY_PVR_URL_PATTERN % (type, parse.quote(
+                channelGroupAll), pvrClient["addonid"], channel["uniqueid"])
+
+        else:
+            paths[channelno] = _PLAY_PVR_URL_PATTERN_V21 % (type, parse.quote(channelGroupAll), _CHANNEL_GROUP_ALL_ID,
+                                                            pvrClient["instanceid"], pvrClient["addonid"], channel["uniqueid"])
+
+    return {"groups": groups, "paths": paths}
+
+
+def get_pvr_channel_path(type: str, channelno: str) -> str:
+
+    # only needed within EPG, so don't load JSON-RPC for other context menu entries
+    from resources.lib.utils.jsonrpc_utils import json_rpc, json_rpc_batch
+
+    try:
+        channelno = int(channelno)
 
-        if channelGroupAll and pvrClient and channels[0]:
-            if get_kodi_version() < 21.0:
-                return _PLAY_PVR_URL_PATTERN % (type, parse.quote(channelGroupAll), pvrClient["addonid"], channels[0]["uniqueid"])
-            else:
-                return _PLAY_PVR_URL_PATTERN_V21 % (type, parse.quote(channelGroupAll), _CHANNEL_GROUP_ALL_ID, pvrClient["instanceid"], pvrClient["addonid"], channels[0]["uniqueid"])
+        # channel groups are cheap to fetch compared to all channels of large EPGs
+        groups = json_rpc("PVR.GetChannelGroups", {"channeltype": type})
+        index = _load_channel_index(type)
+        if not index or index["groups"] != groups:
+            _clients, _channels = json_rpc_batch([
+                ("PVR.GetClients", None),
+                ("PVR.GetChannels", {
+                    "channelgroupid": "all%s" % type, "properties": ["uniqueid", "clientid", "channelnumber"]})
+            ])
+            index = _build_channel_index(type, groups, _clients, _channels)
+            _save_channel_index(type, index)
+
+        return index["paths"].get(str(channelno))
 
     except:
         pass
@@ -1,8 +1,5 @@
 import xbmcgui
 from resources.lib.contextmenu.abstract_set_timer import AbstractSetTimer
-from resources.lib.timer.concurrency import (ask_overlapping_timers,
-                                             get_next_higher_prio,
-                                             get_next_lower_prio)
 from resources.lib.timer.timer import Timer
 from resources.lib.utils.settings_utils import (CONFIRM_CUSTOM, CONFIRM_YES,
                                                 trigger_settings_changed_event)
@@ -60,6 +57,10 @@ class SetQuickEpgTimer(AbstractSetTimer):
 
     def handle_overlapping_timers(self, timer: Timer, overlapping_timers: 'list[Timer]') -> int:
 
+        from resources.lib.timer.concurrency import (ask_overlapping_timers,
+                                                     get_next_higher_prio,
+                                                     get_next_lower_prio)
+
         strategy = self.addon.getSettingInt("quicktimer_priority")
         if strategy == 0:
             timer.priority = get_next_lower_prio(overlapping_timers)
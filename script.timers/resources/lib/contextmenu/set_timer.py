@@ -1,7 +1,6 @@
 import xbmcgui
 from resources.lib.contextmenu.abstract_set_timer import (CONFIRM_CUSTOM,
                                                           AbstractSetTimer)
-from resources.lib.timer.concurrency import ask_overlapping_timers
 from resources.lib.timer.timer import (MEDIA_ACTION_START,
                                        MEDIA_ACTION_START_STOP, Timer)
 from resources.lib.utils import datetime_utils
@@ -86,6 +85,8 @@ class SetTimer(AbstractSetTimer):
 
     def handle_overlapping_timers(self, timer: Timer, overlapping_timers: 'list[Timer]') -> int:
 
+        from resources.lib.timer.concurrency import ask_overlapping_timers
+
         return ask_overlapping_timers(timer, overlapping_timers)
 
     def confirm(self, timer: Timer) -> int:
@@ -0,0 +1,83 @@
+import json
+import os
+
+import xbmc
+import xbmcaddon
+import xbmcvfs
+from resources.lib.utils.lock_utils import get_lock
+
+_MAX_ENTRIES = 10000
+
+
+class DurationCache():
+
+    # durations in seconds by file, shared by all instances within the same process
+    _entries: 'dict[str, float]' = None
+    _dirty = False
+
+    def _get_cache_path(self) -> str:
+
+        addon = xbmcaddon.Addon()
+        profile_path = xbmcvfs.translatePath(addon.getAddonInfo('profile'))
+        return os.path.join(profile_path, "durations.json")
+
+    def _load(self) -> None:
+
+        if DurationCache._entries is not None:
+            return
+
+        DurationCache._entries = dict()
+        cache_path = self._get_cache_path()
+        if not os.path.exists(cache_path):
+            return
+
+        try:
+            with get_lock("%s.lck" % cache_path):
+                with open(cache_path, "r", encoding="utf-8") as file:
+                    DurationCache._entries = json.load(file)
+
+        except (OSError, ValueError):
+            xbmc.log("[script.timers] Can't read duration cache, rebuild it.",
+                     xbmc.LOGWARNING)
+
+    def get(self, file: str) -> float:
+
+        self._load()
+        return DurationCache._entries.get(file, 0.0)
+
+    def set(self, file: str, duration: float) -> None:
+
+        if not file or not duration or duration <= 0:
+            return
+
+        self._load()
+        if DurationCache._entries.get(file) == duration:
+            return
+
+        # re-insert so that least recently learned durations are evicted first
+        DurationCache._entries.pop(file, None)
+        DurationCache._entries[file] = duration
+        while len(DurationCache._entries) > _MAX_ENTRIES:
+            DurationCache._entries.pop(next(iter(DurationCache._entries)))
+
+        DurationCache._dirty = True
+
+    def save(self) -> None:
+
+        if not DurationCache._dirty:
+            return
+
+        cache_path = self._get_cache_path()
+        tmp = "%s.tmp" % cache_path
+        try:
+            with get_lock("%s.lck" % cache_path):
+                with open(tmp, "w", encoding="utf-8") as file:
+                    json.dump(obj=DurationCache._entries, fp=file)
+
+                os.replace(tmp, cache_path)
+
+            DurationCache._dirty = False
+
+        except OSError:
+            xbmc.log("[script.timers] Can't write duration cache.",
+                     xbmc.LOGWARNING)
@@ -0,0 +1,145 @@
+import json
+import os
+import time
+
+import xbmc
+import xbmcaddon
+import xbmcvfs
+from resources.lib.player.mediatype import AUDIO, PICTURE, VIDEO
+from resources.lib.utils.lock_utils import get_lock
+
+
+class MediaIndex():
+
+    # directory listings shared by all instances within the same process
+    _entries: 'dict[str, dict]' = None
+    _dirty = False
+
+    def __init__(self) -> None:
+
+        addon = xbmcaddon.Addon()
+        self._ttl = (addon.getSettingInt("media_index_ttl") or 0) * 60
+
+    def _get_index_path(self) -> str:
+
+        addon = xbmcaddon.Addon()
+        profile_path = xbmcvfs.translatePath(addon.getAddonInfo('profile'))
+        return os.path.join(profile_path, "mediaindex.json")
+
+    def get_ttl(self) -> int:
+
+        return self._ttl
+
+    def is_enabled(self) -> bool:
+
+        return self._ttl > 0
+
+    def _load(self) -> None:
+
+        if MediaIndex._entries is not None:
+            return
+
+        MediaIndex._entries = dict()
+        index_path = self._get_index_path()
+        if not os.path.exists(index_path):
+            return
+
+        try:
+            with get_lock("%s.lck" % index_path):
+                with open(index_path, "r", encoding="utf-8") as file:
+                    MediaIndex._entries = json.load(file)
+
+        except (OSError, ValueError):
+            xbmc.log("[script.timers] Can't read media index, rebuild it.",
+                     xbmc.LOGWARNING)
+
+    def _get_mtime(self, path: str) -> int:
+
+        try:
+            return xbmcvfs.Stat(path).st_mtime()
+        except:
+            return None
+
+    def _get_entry(self, path: str) -> dict:
+
+        if not self.is_enabled():
+            return None
+
+        self._load()
+        entry = MediaIndex._entries.get(path)
+        if entry is None:
+            return None
+
+        now = time.time()
+        if now - entry["checked"] < self._ttl:
+            return entry
+
+        # directories change their mtime if direct children are added or removed
+        mtime = self._get_mtime(path)
+        MediaIndex._dirty = True
+        if mtime and mtime == entry["mtime"]:
+            entry["checked"] = now
+            return entry
+
+        MediaIndex._entries.pop(path)
+        return None
+
+    def listdir(self, path: str) -> 'tuple[list[str], list[str]]':
+
+        entry = self._get_entry(path)
+        if entry:
+            return entry["dirs"], entry["files"]
+
+        dirs, files = xbmcvfs.listdir(path)
+        if self.is_enabled() and (dirs or files):
+            MediaIndex._entries[path] = {
+                "mtime": self._get_mtime(path),
+                "checked": time.time(),
+                "dirs": dirs,
+                "files": files,
+                "types": None
+            }
+            MediaIndex._dirty = True
+
+        return dirs, files
+
+    def get_types(self, path: str) -> 'dict[str, str]':
+
+        entry = self._get_entry(path)
+        return entry["types"] if entry else None
+
+    def set_types(self, path: str, types: 'dict[str, str]') -> None:
+
+        entry = self._get_entry(path)
+        if entry:
+            entry["types"] = types
+            MediaIndex._dirty = True
+
+    def get_counts(self, path: str) -> 'tuple[int, int, int]':
+
+        types = self.get_types(path)
+        if types is None:
+            return None
+
+        values = list(types.values())
+        return values.count(AUDIO), values.count(VIDEO), values.count(PICTURE)
+
+    def save(self) -> None:
+
+        if not MediaIndex._dirty:
+            return
+
+        index_path = self._get_index_path()
+        tmp = "%s.tmp" % index_path
+        try:
+            with get_lock("%s.lck" % index_path):
+                with open(tmp, "w", encoding="utf-8") as file:
+                    json.dump(obj=MediaIndex._entries, fp=file)
+
+                os.replace(tmp, index_path)
+
+            MediaIndex._dirty = False
+
+        except OSError:
+            xbmc.log("[script.timers] Can't write media index.",
+                     xbmc.LOGWARNING)
@@ -4,3 +4,19 @@ PICTURE = "picture"
 SCRIPT = "script"
 
 TYPES = [AUDIO, VIDEO, PICTURE]
+
+
+def get_types_replaced_by_type(type: str) -> 'list[str]':
+
+    type = type if type else VIDEO
+    if type == AUDIO:
+        return [VIDEO, AUDIO]
+
+    elif type == VIDEO:
+        return [PICTURE, VIDEO, AUDIO]
+
+    elif type == PICTURE:
+        return [PICTURE, VIDEO]
+
+    else:
+        return []
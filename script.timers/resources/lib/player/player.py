@@ -1,15 +1,18 @@
+import threading
 from datetime import timedelta
 
 import xbmc
 from resources.lib.player import player_utils
+from resources.lib.player.durationcache import DurationCache
 from resources.lib.player.mediatype import AUDIO, PICTURE, TYPES, VIDEO
 from resources.lib.player.playerstatus import PlayerStatus
 from resources.lib.player.playlist import PlayList
 from resources.lib.timer.notification import showNotification
 from resources.lib.timer.timer import Timer
 from resources.lib.utils import datetime_utils
+from resources.lib.utils.profiling_utils import profiled
 from resources.lib.utils.vfs_utils import (convert_to_playlist,
-                                           get_files_and_type,
+                                           fill_playlist, get_files_and_type,
                                            get_longest_common_path)
 
 
@@ -24,18 +27,24 @@ class Player(xbmc.Player):
         self._seek_delayed_timer = False
         self._default_volume: int = 100
         self._recent_volume: int = None
+        self._on_volume_changed: 'callable' = None
 
         self._paused: bool = False
 
         self._seektime: float = None
+        self._seek_in_background = True
         self._playlist_timeline: 'list[float]' = list()
         self._playlist: PlayList = None
+        self._fingerprints: 'dict[str, player_utils.PlaylistFingerprint]' = dict()
+        self._fillings: 'dict[int, threading.Thread]' = dict()
         self._skip_next_stop_event_until_started = False
 
         self._resume_status: 'dict[PlayerStatus]' = dict()
 
         self._running_stop_at_end_timer: 'tuple[Timer, bool]' = (None, False)
 
+        self._wakeup_listener = None
+
         self.__is_unit_test__: bool = False
 
     def playTimer(self, timer: Timer, dtd: datetime_utils.DateTimeDelta) -> None:
@@ -100,11 +109,14 @@ class Player(xbmc.Player):
                                 shuffle=timer.shuffle, beginSlide=beginSlide, amount=amountOfSlides)
 
         else:
+            # shuffling and seeking need the complete playlist
             playlist = self._buildPlaylist(
-                paths=files, type=type, label=timer.label)
+                paths=files, type=type, label=timer.label, progressive=not timer.shuffle and not seektime and not state_from_path)
 
             if timer.shuffle:
                 playlist.shuffle()
+            else:
+                self._setFingerprint(type, files, playlist)
 
             self._playAV(playlist=playlist,
                          startpos=state_from_path.position if state_from_path and state_from_path.position > 0 else 0,
@@ -134,13 +146,42 @@ class Player(xbmc.Player):
         self.setShuffled(shuffled)
         self.setSpeed(speed)
 
+        if playlist.pending:
+            self._fillings[playlist.getPlayListId()] = threading.Thread(
+                target=fill_playlist, args=(playlist,), daemon=True)
+            self._fillings[playlist.getPlayListId()].start()
+
+    def _isFilling(self, type: str) -> bool:
+
+        filling = self._fillings.get(TYPES.index(type))
+        return filling is not None and filling.is_alive()
+
     def _playSlideShow(self, path: str, beginSlide=None, shuffle=False, amount=0) -> None:
 
         player_utils.play_slideshow(
             path=path, beginSlide=beginSlide, shuffle=shuffle, amount=amount)
 
+    def _setFingerprint(self, type: str, files: 'list[str]', playlist: PlayList) -> None:
+
+        if playlist.directUrl:
+            self._fingerprints.pop(type, None)
+        else:
+            self._fingerprints[type] = player_utils.PlaylistFingerprint(files)
+
     def _isPlaying(self, files, type, repeat=player_utils.REPEAT_OFF) -> bool:
 
+        # most playlists have been built by this addon, so they can be recognized by
+        # their bounds instead of downloading and comparing all items
+        fingerprint = self._fingerprints.get(type)
+        if fingerprint:
+            bounds = self.getActivePlaylistBounds(type)
+            # a playlist that is still being filled is shorter than its fingerprint
+            if bounds and (fingerprint.matches_bounds(bounds) or self._isFilling(type) and bounds[0] <= fingerprint.size and bounds[1] == fingerprint.first):
+                return fingerprint == player_utils.PlaylistFingerprint(files) and bounds[3] == repeat
+
+            elif bounds and (bounds[0] != len(files) or bounds[1] != files[0]):
+                return False
+
         ap = self.getActivePlayersWithPlaylist(type)
         return type in ap and files == [e["file"] for e in ap[type].playlist] and ap[type].repeat == repeat
 
@@ -148,9 +189,9 @@ class Player(xbmc.Player):
 
         return get_files_and_type(path)
 
-    def _buildPlaylist(self, paths: 'list[str]', type: str, label: str) -> 'xbmc.PlayList':
+    def _buildPlaylist(self, paths: 'list[str]', type: str, label: str, progressive=False) -> 'xbmc.PlayList':
 
-        return convert_to_playlist(paths=paths, type=type, label=label)
+        return convert_to_playlist(paths=paths, type=type, label=label, progressive=progressive)
 
     def stopPlayer(self, type: str) -> 'player_utils.State':
 
@@ -162,14 +203,17 @@ class Player(xbmc.Player):
 
     def onAVStarted(self) -> None:
 
+        player_utils.invalidate_player_states()
         self._paused = False
         self._skip_next_stop_event_until_started = False
         if self._recent_volume == None:
             self._recent_volume = self.getVolume()
-        self._seekRetroactivly()
+        self._startSeekRetroactivly()
+        self._notifyWakeupListener()
 
     def onPlayBackStopped(self) -> None:
 
+        player_utils.invalidate_player_states()
         self._paused = False
         if self._skip_next_stop_event_until_started:
             self._skip_next_stop_event_until_started = False
@@ -183,8 +227,11 @@ class Player(xbmc.Player):
                 self._running_stop_at_end_timer = (_rst[0], True)
                 showNotification(_rst[0], msg_id=32289)
 
+        self._notifyWakeupListener()
+
     def onPlayBackEnded(self) -> None:
 
+        player_utils.invalidate_player_states()
         self._paused = False
         if VIDEO in self._resume_status:
             self._resumeFormer(type=VIDEO, keep=True)
@@ -195,9 +242,13 @@ class Player(xbmc.Player):
         else:
             self._reset()
 
+        self._notifyWakeupListener()
+
     def onPlayBackError(self) -> None:
 
+        player_utils.invalidate_player_states()
         self._reset()
+        self._notifyWakeupListener()
 
     def onPlayBackPaused(self) -> None:
 
@@ -211,6 +262,15 @@ class Player(xbmc.Player):
 
         return self._paused
 
+    def setWakeupListener(self, listener: 'callable') -> None:
+
+        self._wakeup_listener = listener
+
+    def _notifyWakeupListener(self) -> None:
+
+        if self._wakeup_listener:
+            self._wakeup_listener()
+
     def resumeFormerOrStop(self, timer: Timer) -> None:
 
         if not timer.is_resuming_timer() or not self._resumeFormer(type=timer.media_type, keep=False):
@@ -249,6 +309,7 @@ class Player(xbmc.Player):
                             state.playlist) else ""
                         playlist = self._buildPlaylist(
                             paths=paths, type=state.type, label=label)
+                        self._setFingerprint(state.type, paths, playlist)
                         self._playAV(
                             playlist,
                             startpos=state.position,
@@ -276,6 +337,10 @@ class Player(xbmc.Player):
 
         return player_utils.get_active_players_with_playlist(type=type)
 
+    def getActivePlaylistBounds(self, type: str) -> 'tuple[int, str, str, str]':
+
+        return player_utils.get_active_playlist_bounds(type)
+
     def _getResumeStatus(self, type: str) -> PlayerStatus:
 
         if type in self._resume_status:
@@ -304,12 +369,66 @@ class Player(xbmc.Player):
         else:
             self._resume_status = dict()
 
+    def _startSeekRetroactivly(self) -> None:
+
+        # waiting for playback must not block the thread of Kodi's callbacks
+        if self._seektime and self._seek_in_background:
+            threading.Thread(target=self._seekRetroactivly,
+                             daemon=True).start()
+
+        else:
+            self._seekRetroactivly()
+
+    def _getPlaylistDurations(self) -> 'list[float]':
+
+        return player_utils.get_playlist_durations(self._playlist.getPlayListId())
+
+    def _rememberDuration(self, duration: float) -> None:
+
+        durations = DurationCache()
+        durations.set(self.getPlayingFile(), duration)
+        durations.save()
+
+    def _openPlaylistAt(self, position: int, seektime: float) -> None:
+
+        player_utils.open_playlist_at(
+            self._playlist.getPlayListId(), position, seektime)
+
+    @profiled("player.seek_retroactively")
     def _seekRetroactivly(self) -> None:
 
+        def _seekByDurations() -> bool:
+
+            # jump directly to the item if durations of all items are known from library
+            durations = self._getPlaylistDurations()
+            if len(durations) != self._playlist.size() or not all(durations):
+                return False
+
+            bounds = self.getActivePlaylistBounds(
+                TYPES[self._playlist.getPlayListId()])
+            target = player_utils.get_seek_position(durations, start=self._playlist.getposition(), seektime=self._seektime,
+                                                    repeat_all=bounds is not None and bounds[3] == player_utils.REPEAT_ALL)
+            if target is None:
+                self.stop()
+                self._resetSeek()
+
+            elif target[0] == self._playlist.getposition():
+                self._resetSeek()
+                self.seekTime(target[1])
+
+            else:
+                # volume is restored as soon as the item has been started
+                self._seektime = None
+                self._skip_next_stop_event_until_started = True
+                self._openPlaylistAt(*target)
+
+            return True
+
         def _seekTimeInPlaylist() -> None:
 
             _totalTime = self.getTotalTime()
             self._playlist_timeline.append(_totalTime)
+            self._rememberDuration(_totalTime)
             if self._playlist.getposition() < self._playlist.size() - 1:
                 self._seektime -= _totalTime
                 self._skip_next_stop_event_until_started = True
@@ -319,10 +438,8 @@ class Player(xbmc.Player):
                 _activePlayer = self.getActivePlayersWithPlaylist(
                     TYPES[self._playlist.getPlayListId()])
                 if _activePlayer and _activePlayer[TYPES[self._playlist.getPlayListId()]].repeat == player_utils.REPEAT_ALL:
-                    i = 0
-                    while self._seektime > self._playlist_timeline[i]:
-                        self._seektime -= self._playlist_timeline[i]
-                        i = (i + 1) % len(self._playlist_timeline)
+                    i, self._seektime = player_utils.get_seek_position(
+                        self._playlist_timeline, start=len(self._playlist_timeline) - 1, seektime=self._seektime, repeat_all=True)
 
                     _state = _activePlayer[TYPES[self._playlist.getPlayListId()]]
                     self._playAV(playlist=self._playlist, startpos=i,
@@ -337,7 +454,7 @@ class Player(xbmc.Player):
             self._resetSeek()
             return
 
-        self.setVolume(0)
+        self._setOwnVolume(0)
 
         tries = 0
         xbmc.sleep(500)
@@ -350,7 +467,8 @@ class Player(xbmc.Player):
             self._resetSeek()
 
         elif self._playlist.size() and self._seektime >= _totalTime:
-            _seekTimeInPlaylist()
+            if not _seekByDurations():
+                _seekTimeInPlaylist()
 
         else:
             seektime = self._seektime
@@ -364,7 +482,7 @@ class Player(xbmc.Player):
     def _resetSeek(self) -> None:
 
         if self._recent_volume:
-            self.setVolume(self._recent_volume)
+            self._setOwnVolume(self._recent_volume)
         self._recent_volume = None
         self._seektime = None
         self._playlist_timeline = list()
@@ -389,6 +507,17 @@ class Player(xbmc.Player):
 
         player_utils.set_volume(volume)
 
+    def setOnVolumeChanged(self, callback: 'callable') -> None:
+
+        # informs about volume changes of the player itself, e.g. muting while seeking
+        self._on_volume_changed = callback
+
+    def _setOwnVolume(self, volume: int) -> None:
+
+        self.setVolume(volume)
+        if self._on_volume_changed:
+            self._on_volume_changed()
+
     def getDefaultVolume(self) -> int:
 
         return self._default_volume
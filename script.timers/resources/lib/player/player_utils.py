@@ -1,10 +1,18 @@
+import bisect
+import copy
+import hashlib
+import itertools
+import time
+
 import xbmc
 import xbmcaddon
 import xbmcgui
-from resources.lib.player.mediatype import AUDIO, PICTURE, TYPES, VIDEO
+from resources.lib.player.durationcache import DurationCache
+from resources.lib.player.mediatype import (AUDIO, PICTURE, TYPES, VIDEO,
+                                           get_types_replaced_by_type)
 from resources.lib.timer.storage import Storage
 from resources.lib.utils import picture_utils
-from resources.lib.utils.jsonrpc_utils import json_rpc
+from resources.lib.utils.jsonrpc_utils import json_rpc, json_rpc_batch
 from resources.lib.utils.vfs_utils import (build_playlist, convert_to_playlist,
                                            get_asset_path, get_files_and_type,
                                            get_longest_common_path, is_script)
@@ -13,6 +21,13 @@ REPEAT_OFF = "off"
 REPEAT_ONE = "one"
 REPEAT_ALL = "all"
 
+# snapshots of player states are shared within one scheduler tick
+_STATE_CACHE_TTL = 1.0
+
+# (time of fetch, states) is replaced as a whole since other threads may invalidate it
+_state_cache: 'tuple[float, dict[str, State]]' = None
+_state_cache_generation = 0
+
 
 class State():
 
@@ -39,6 +54,26 @@ class State():
                                                                                                                        self.speed)
 
 
+class PlaylistFingerprint():
+
+    def __init__(self, files: 'list[str]') -> None:
+
+        self.size = len(files)
+        self.first = files[0] if files else None
+        self.last = files[-1] if files else None
+        self.digest = hashlib.sha1(
+            "\n".join(files).encode("utf-8")).hexdigest()
+
+    def __eq__(self, other: object) -> bool:
+
+        return isinstance(other, PlaylistFingerprint) and self.digest == other.digest and self.size == other.size
+
+    def matches_bounds(self, bounds: 'tuple[int, str, str, str]') -> bool:
+
+        size, first, last, _ = bounds
+        return self.size == size and self.first == first and self.last == last
+
+
 def preview(addon: xbmcaddon.Addon, timerid: int, player: 'xbmc.Player') -> None:
 
     timer = Storage().load_timer_from_storage(timerid)
@@ -80,6 +115,7 @@ def play_slideshow(path: str, beginSlide: str = None, shuffle=False, amount=0) -
                                                 (",beginslide=%s" % beginSlide) if beginSlide and "," not in beginSlide else "")
     xbmc.log("[script.timers] %s" % cmd, xbmc.LOGINFO)
     xbmc.executebuiltin(cmd)
+    invalidate_player_states()
 
 
 def run_addon(path: str) -> None:
@@ -118,9 +154,36 @@ def reset_volume(addon: xbmcaddon.Addon) -> None:
         32027), addon.getLocalizedString(32112))
 
 
+def invalidate_player_states() -> None:
+
+    global _state_cache, _state_cache_generation
+    _state_cache_generation += 1
+    _state_cache = None
+
+
 def get_active_players_with_playlist(type=None) -> 'dict[str, State]':
 
-    def _get_player_properties(playerId: int) -> dict:
+    global _state_cache
+
+    # states of all players are fetched even if filtered by type, since
+    # the remaining types are usually requested within the same tick
+    now = time.monotonic()
+    cache = _state_cache
+    if cache is None or now - cache[0] > _STATE_CACHE_TTL:
+        generation = _state_cache_generation
+        cache = now, _fetch_active_players_with_playlist()
+
+        # states that have been invalidated while fetching are not shared
+        if generation == _state_cache_generation:
+            _state_cache = cache
+
+    # callers may modify states, e.g. the position
+    return {_type: copy.copy(_state) for _type, _state in cache[1].items() if not type or _type == type}
+
+
+def _fetch_active_players_with_playlist() -> 'dict[str, State]':
+
+    def _get_player_properties(playerId: int) -> 'tuple[str, dict]':
 
         _params = {
             "playerid": playerId,
@@ -134,9 +197,9 @@ def get_active_players_with_playlist(type=None) -> 'dict[str, State]':
                 "speed"
             ]
         }
-        return json_rpc("Player.GetProperties", _params)
+        return "Player.GetProperties", _params
 
-    def _get_playlist(playListID: int) -> dict:
+    def _get_playlist(playListID: int) -> 'tuple[str, dict]':
 
         _params = {
             "playlistid": playListID,
@@ -147,39 +210,47 @@ def get_active_players_with_playlist(type=None) -> 'dict[str, State]':
                 "start": 0
             }
         }
-        return json_rpc("Playlist.GetItems", _params)
+        return "Playlist.GetItems", _params
 
-    def _get_player_item(playListID: int) -> dict:
+    def _get_player_item(playListID: int) -> 'tuple[str, list]':
 
         _params = [playListID, ["file"]]
-        return json_rpc("Player.GetItem", _params)
+        return "Player.GetItem", _params
 
     result = dict()
 
     _activePlayers = get_active_players()
-    if type:
-        if type in _activePlayers:
-            _activePlayers = {
-                type: _activePlayers[type]
-            }
+
+    # one round trip for the properties of all players and one for their playlists
+    _types = list(_activePlayers)
+    _allProps = json_rpc_batch(
+        [_get_player_properties(_activePlayers[_type]) for _type in _types])
+
+    _player = xbmc.Player()
+    _calls = list()
+    for _type, _props in zip(_types, _allProps):
+        if _props["position"] != -1:
+            _calls.append(_get_playlist(_props["playlistid"]))
+        elif _player.isPlaying():
+            _calls.append(_get_player_item(_activePlayers[_type]))
         else:
-            return result
+            _calls.append(None)
 
-    for _type in _activePlayers:
+    _responses = iter(json_rpc_batch([c for c in _calls if c]))
+
+    for _type, _props, _call in zip(_types, _allProps, _calls):
         _playerId = _activePlayers[_type]
-        _props = _get_player_properties(_playerId)
+        _response = next(_responses) if _call else None
         if _props["position"] != -1:
-            _playList = _get_playlist(_props["playlistid"])
+            _playList = _response
         else:
             _playList = {
                 "items": []
             }
-            _player = xbmc.Player()
-            if _player.isPlaying():
-                _item = _get_player_item(_playerId)
+            if _response:
                 _playList["items"].append(
                     {
-                        "label": _item["item"]["label"],
+                        "label": _response["item"]["label"],
                         "file": _player.getPlayingFile()
                     })
 
@@ -209,17 +280,20 @@ def set_repeat(mode: str) -> None:
     }
 
     xbmc.executebuiltin("PlayerControl(%s)" % _REPEAT_COMMAND[mode])
+    invalidate_player_states()
 
 
 def set_shuffled(value: bool) -> None:
 
     xbmc.executebuiltin("PlayerControl(%s)" %
                         "RandomOn" if value else "RandomOff")
+    invalidate_player_states()
 
 
 def set_speed(speed: float) -> None:
 
     xbmc.executebuiltin("PlayerControl(Tempo(%f))" % speed)
+    invalidate_player_states()
 
 
 def get_active_players() -> 'dict[str,int]':
@@ -232,6 +306,100 @@ def get_active_players() -> 'dict[str,int]':
     return active_players
 
 
+def get_active_playlist_bounds(type: str) -> 'tuple[int, str, str, str]':
+
+    # returns size, first and last file and repeat mode of the playlist of the active
+    # player in two round trips without fetching all items. Returns None if there is no active playlist
+    if type == PICTURE:
+        return None
+
+    _playlistId = TYPES.index(type)
+    _players, _size, _first = json_rpc_batch([
+        ("Player.GetActivePlayers", None),
+        ("Playlist.GetProperties", {
+         "playlistid": _playlistId, "properties": ["size"]}),
+        ("Playlist.GetItems", {"playlistid": _playlistId, "properties": [
+         "file"], "limits": {"start": 0, "end": 1}})
+    ])
+
+    _activePlayers = {ap["type"]: ap["playerid"] for ap in _players or list()}
+    if type not in _activePlayers or not _size or not _size["size"] or not _first or "items" not in _first:
+        return None
+
+    size = _size["size"]
+    calls = [("Player.GetProperties", {"playerid": _activePlayers[type],
+                                       "properties": ["playlistid", "position", "repeat"]})]
+    if size > 1:
+        calls.append(("Playlist.GetItems", {"playlistid": _playlistId, "properties": [
+                     "file"], "limits": {"start": size - 1, "end": size}}))
+
+    _results = json_rpc_batch(calls)
+    _props = _results[0]
+    if not _props or _props["position"] == -1 or _props["playlistid"] != _playlistId:
+        return None
+
+    first = _first["items"][0]["file"]
+    if size > 1:
+        last = _results[1]["items"][0]["file"] if _results[1] and "items" in _results[1] else None
+    else:
+        last = first
+
+    return size, first, last, _props["repeat"]
+
+
+def get_playlist_durations(playlistId: int) -> 'list[float]':
+
+    # durations come from library, otherwise from cache of former lookups and playbacks
+    _result = json_rpc("Playlist.GetItems", {"playlistid": playlistId, "properties": [
+                       "file", "duration", "runtime"]})
+    if not _result or "items" not in _result:
+        return list()
+
+    cache = DurationCache()
+    files = [item.get("file") for item in _result["items"]]
+    durations = [float(item.get("duration") or item.get("runtime") or 0) or cache.get(file)
+                 for item, file in zip(_result["items"], files)]
+
+    unknown = [i for i, d in enumerate(durations) if not d and files[i]]
+    media = "music" if TYPES[playlistId] == AUDIO else "video"
+    details = json_rpc_batch([("Files.GetFileDetails", {"file": files[i], "media": media,
+                                                        "properties": ["duration", "runtime"]}) for i in unknown])
+    for i, detail in zip(unknown, details):
+        if detail and "filedetails" in detail:
+            _details = detail["filedetails"]
+            durations[i] = float(_details.get("duration")
+                                 or _details.get("runtime") or 0)
+            cache.set(files[i], durations[i])
+
+    cache.save()
+    return durations
+
+
+def get_seek_position(durations: 'list[float]', start: int, seektime: float, repeat_all: bool) -> 'tuple[int, float]':
+
+    # returns position and time within item of a playlist that has been played
+    # for <seektime> seconds from item <start>. Returns None if playlist has ended
+    offsets = list(itertools.accumulate(durations, initial=0.0))
+    target = offsets[start] + seektime
+    if target >= offsets[-1]:
+        if not repeat_all or not offsets[-1]:
+            return None
+
+        target %= offsets[-1]
+
+    position = bisect.bisect_right(offsets, target) - 1
+    return position, target - offsets[position]
+
+
+def open_playlist_at(playlistId: int, position: int, seektime: float) -> None:
+
+    hours, rest = divmod(int(seektime), 3600)
+    minutes, seconds = divmod(rest, 60)
+    json_rpc("Player.Open", {"item": {"playlistid": playlistId, "position": position},
+                             "options": {"resume": {"hours": hours, "minutes": minutes, "seconds": seconds, "milliseconds": 0}}})
+    invalidate_player_states()
+
+
 def stop_player(type: str) -> State:
 
     _activePlayers = get_active_players_with_playlist(type)
@@ -239,6 +407,7 @@ def stop_player(type: str) -> State:
         return None
 
     json_rpc("Player.Stop", params=[_activePlayers[type].playerId])
+    invalidate_player_states()
     xbmc.sleep(500)
 
     return _activePlayers[type]
@@ -251,22 +420,6 @@ def get_slideshow_staytime() -> int:
     return _result["value"]
 
 
-def get_types_replaced_by_type(type: str) -> 'list[str]':
-
-    type = type if type else VIDEO
-    if type == AUDIO:
-        return [VIDEO, AUDIO]
-
-    elif type == VIDEO:
-        return [PICTURE, VIDEO, AUDIO]
-
-    elif type == PICTURE:
-        return [PICTURE, VIDEO]
-
-    else:
-        return []
-
-
 def add_player_state_to_path(state: State) -> str:
 
     paths = [item["file"] for item in state.playlist]
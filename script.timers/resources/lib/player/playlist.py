@@ -6,3 +6,4 @@ class PlayList(xbmc.PlayList):
     def __init__(self, playList: int) -> None:
         super().__init__(playList)
         self.directUrl: str = None
+        self.pending: 'list[str]' = list()
@@ -14,6 +14,7 @@ class PlayList():
         self.paths: 'list[str]' = None
         self.position: int = 0
         self.directUrl: str = None
+        self.pending: 'list[str]' = list()
 
     def getPlayListId(self) -> int:
 
@@ -40,6 +41,7 @@ class MockPlayer(Player):
         self._player_status: 'dict[PlayerStatus]' = dict()
         self._volume: int = 100
         self._slideShowStaytime: int = 5
+        self._seek_in_background = False
 
     def _playSlideShow(self, path: str, beginSlide=None, shuffle=False, amount=0) -> None:
 
@@ -94,20 +96,37 @@ class MockPlayer(Player):
 
         return VIDEO in self._player_status
 
+    def _getDuration(self, file: str) -> float:
+
+        m = re.match(".*\(([0-9]+:[0-9]{2})\)$", file)
+        if m:
+            s = m.groups()[0].split(":")
+            return float(s[0]) * 3600 + float(s[1]) * 60
+
+        else:
+            return 0.0
+
     def getTotalTime(self) -> float:
 
         if self.isPlaying():
-            f = self._playlist.paths[self._playlist.position]["file"]
-            m = re.match(".*\(([0-9]+:[0-9]{2})\)$", f)
-            if m:
-                s = m.groups()[0].split(":")
-                return float(s[0]) * 3600 + float(s[1]) * 60
-
-            else:
-                return 0.0
+            return self._getDuration(self._playlist.paths[self._playlist.position]["file"])
+
         else:
             return 0.0
 
+    def _getPlaylistDurations(self) -> 'list[float]':
+
+        return [self._getDuration(p["file"]) for p in self._playlist.paths]
+
+    def _rememberDuration(self, duration: float) -> None:
+
+        pass
+
+    def _openPlaylistAt(self, position: int, seektime: float) -> None:
+
+        self.play(self._playlist, startpos=position)
+        self.seekTime(seektime)
+
     def playnext(self) -> None:
 
         if self.isPlayingVideo():
@@ -139,7 +158,7 @@ class MockPlayer(Player):
 
         return path.split("|"), type
 
-    def _buildPlaylist(self, paths: 'list[str]', type: str, label="") -> 'PlayList':
+    def _buildPlaylist(self, paths: 'list[str]', type: str, label="", progressive=False) -> 'PlayList':
 
         playlist = PlayList()
         playlist.paths = [
@@ -169,6 +188,14 @@ class MockPlayer(Player):
 
         return newState
 
+    def getActivePlaylistBounds(self, type: str) -> 'tuple[int, str, str, str]':
+
+        if type not in self._player_status or not self._player_status[type].playlist:
+            return None
+
+        files = [e["file"] for e in self._player_status[type].playlist]
+        return len(files), files[0], files[-1], self._player_status[type].repeat
+
     def getVolume(self) -> int:
 
         return self._volume
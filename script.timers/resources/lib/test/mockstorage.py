@@ -7,6 +7,11 @@ class MockStorage(Storage):
         super().__init__()
 
         self._data = data
+        self._expiry_index: dict = dict()
+
+    def _get_cache_key(self) -> 'tuple':
+
+        return None
 
     def release_lock(self) -> None:
 
@@ -20,3 +25,19 @@ class MockStorage(Storage):
 
         storage.sort(key=lambda item: item["id"])
         self._data = storage
+
+    def _append_to_journal(self, entries: 'list[dict]') -> None:
+
+        self._data = self._apply_journal(self._data, entries)
+
+    def load_changes_since(self, key: list, offset: int) -> 'tuple[list, int, dict]':
+
+        return None, 0, None
+
+    def load_expiry_index(self) -> dict:
+
+        return self._expiry_index
+
+    def save_expiry_index(self, index: dict) -> None:
+
+        self._expiry_index = index
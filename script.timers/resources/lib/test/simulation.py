@@ -0,0 +1,232 @@
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+from resources.lib.player.mediatype import AUDIO, PICTURE, VIDEO
+from resources.lib.test.mockplayer import MockPlayer
+from resources.lib.test.mockstorage import MockStorage
+from resources.lib.timer.scheduler import (CHECK_INTERVAL, MIN_INTERVAL,
+                                           Scheduler)
+from resources.lib.timer.scheduleraction import SchedulerAction
+from resources.lib.timer.timer import (END_TYPE_DURATION, FADE_IN_FROM_MIN,
+                                       FADE_OFF, FADE_OUT_FROM_CURRENT,
+                                       MEDIA_ACTION_NONE,
+                                       MEDIA_ACTION_START_STOP,
+                                       MEDIA_ACTION_STOP_AT_END,
+                                       SYSTEM_ACTION_NONE,
+                                       SYSTEM_ACTION_STANDBY, TIMER_BY_DATE,
+                                       TIMER_WEEKLY, Timer)
+from resources.lib.utils.datetime_utils import DateTimeDelta
+
+# Monday, so that the first simulated day is the first weekday
+SIMULATION_START = datetime(2024, 1, 1)
+
+
+class SimulationClock():
+
+    def __init__(self, start: datetime = SIMULATION_START) -> None:
+
+        self.dt = start
+
+    def now(self) -> DateTimeDelta:
+
+        return DateTimeDelta(self.dt)
+
+    def advance(self, seconds: float) -> None:
+
+        self.dt += timedelta(seconds=seconds)
+
+
+class SimulationReport():
+
+    def __init__(self) -> None:
+
+        self.ticks = 0
+        self.events = 0
+        self.json_rpc_calls = 0
+        self.builtin_calls = 0
+        self.volume_writes = 0
+        self.calculate_secs: 'list[float]' = list()
+        self.perform_secs: 'list[float]' = list()
+
+    def _percentile(self, values: 'list[float]', p: float) -> float:
+
+        if not values:
+            return 0.0
+
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * p))]
+
+    def __str__(self) -> str:
+
+        lines = ["ticks=%i, events=%i, json_rpc_calls=%i, builtin_calls=%i, volume_writes=%i" % (
+            self.ticks, self.events, self.json_rpc_calls, self.builtin_calls, self.volume_writes)]
+        for name, values in [("calculate", self.calculate_secs), ("perform", self.perform_secs)]:
+            lines.append("%s: n=%i, total=%.3fs, p50=%.1fus, p99=%.1fus, max=%.1fus" % (
+                name, len(values), sum(values),
+                self._percentile(values, 0.5) * 1e6,
+                self._percentile(values, 0.99) * 1e6,
+                max(values, default=0.0) * 1e6))
+
+        return "\n".join(lines)
+
+
+def generate_timers(amount: int, overlap=0.2, system_ratio=0.05, seed=0) -> 'list[Timer]':
+
+    # <overlap> is the share of timers that start within the period of
+    # another timer, <system_ratio> is the share of timers with system action
+    rnd = random.Random(seed)
+    timers: 'list[Timer]' = list()
+    for i in range(1, amount + 1):
+
+        timer = Timer(i)
+        timer.label = "Timer %i" % i
+        timer.notify = False
+        timer.priority = rnd.randrange(0, 3)
+
+        if timers and rnd.random() < overlap:
+            other = rnd.choice(timers)
+            minutes = _to_minutes(other.start) + \
+                rnd.randrange(0, max(1, _to_minutes(other.duration)))
+            timer.days = list(other.days)
+            timer.date = other.date
+        else:
+            minutes = rnd.randrange(0, 24 * 60)
+            if rnd.random() < 0.1:
+                timer.days = [TIMER_BY_DATE]
+                timer.date = (SIMULATION_START + timedelta(
+                    days=rnd.randrange(0, 7))).strftime("%Y-%m-%d")
+            else:
+                timer.days = sorted(rnd.sample(
+                    range(7), rnd.randrange(1, 4))) + [TIMER_WEEKLY]
+
+        timer.start = "%02i:%02i" % ((minutes // 60) % 24, minutes % 60)
+        timer.end_type = END_TYPE_DURATION
+        timer.duration = "%02i:%02i" % divmod(rnd.randrange(5, 120), 60)
+
+        if rnd.random() < system_ratio:
+            timer.media_action = MEDIA_ACTION_NONE
+            timer.system_action = SYSTEM_ACTION_STANDBY
+        else:
+            timer.media_action = rnd.choice(
+                [MEDIA_ACTION_START_STOP, MEDIA_ACTION_START_STOP, MEDIA_ACTION_STOP_AT_END])
+            timer.system_action = SYSTEM_ACTION_NONE
+            timer.media_type = rnd.choice([AUDIO, AUDIO, VIDEO, PICTURE])
+            timer.path = "sim/%s/%i" % (timer.media_type, i)
+            timer.repeat = rnd.random() < 0.5
+            timer.resume = rnd.random() < 0.5
+            timer.fade = rnd.choice(
+                [FADE_OFF, FADE_OFF, FADE_IN_FROM_MIN, FADE_OUT_FROM_CURRENT])
+            timer.vol_min = 50
+
+        timer.init()
+        timers.append(timer)
+
+    return timers
+
+
+def _to_minutes(hh_mm: str) -> int:
+
+    hours, minutes = hh_mm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+class SimulatedScheduler(Scheduler):
+
+    # scheduler without Kodi services, only its waits are used
+    def __init__(self, action: SchedulerAction, timers: 'list[Timer]') -> None:
+
+        self._timers = timers
+        self._pause_from: datetime = None
+        self._pause_until: datetime = None
+        self._powermanagement_displaysoff = 0
+        self.action = action
+
+
+class Simulation():
+
+    def __init__(self, timers: 'list[Timer]', clock: SimulationClock = None, event_driven=False) -> None:
+
+        self.clock = clock or SimulationClock()
+        self.report = SimulationReport()
+        self._event_driven = event_driven
+
+        self.player = MockPlayer()
+        self.player.setDefaultVolume(100)
+        _set_volume = self.player.setVolume
+
+        def _count_volume(volume: int) -> None:
+
+            self.report.volume_writes += 1
+            _set_volume(volume)
+
+        self.player.setVolume = _count_volume
+
+        self.storage = MockStorage(list())
+        self.storage.replace_storage(timers)
+        self._timers = self.storage.get_scheduled_timers()
+
+        self.action = SchedulerAction(self.player, self.storage)
+        self.action.__is_unit_test__ = True
+        self.scheduler = SimulatedScheduler(self.action, self._timers)
+        self._interval = CHECK_INTERVAL
+
+    def _count_json_rpc(self, *args, **kwargs) -> str:
+
+        self.report.json_rpc_calls += 1
+        return "{}"
+
+    def _count_builtin(self, *args, **kwargs) -> None:
+
+        self.report.builtin_calls += 1
+
+    def _tick(self) -> float:
+
+        now = self.clock.now()
+        if self.action.upcoming_event is None or self.action.upcoming_event < now.dt:
+            t0 = time.perf_counter()
+            self.action.calculate(self._timers, now)
+            self.report.calculate_secs.append(time.perf_counter() - t0)
+            self._interval = self.action.getFaderInterval() or CHECK_INTERVAL
+
+        if self.action.hasEventToPerform:
+            self.report.events += 1
+
+        t0 = time.perf_counter()
+        self.action.perform(now)
+        self.report.perform_secs.append(time.perf_counter() - t0)
+        self.report.ticks += 1
+
+        if self._event_driven:
+            wait = self.scheduler._get_event_driven_wait(now)
+        else:
+            wait = self.scheduler._get_polling_wait(now, self._interval)
+
+        # a real clock moves on even if the scheduler doesn't wait at all
+        return wait if wait > 0 else MIN_INTERVAL
+
+    def run(self, duration: timedelta) -> SimulationReport:
+
+        until = self.clock.dt + duration
+        with mock.patch("xbmc.executeJSONRPC", side_effect=self._count_json_rpc), \
+                mock.patch("xbmc.executebuiltin", side_effect=self._count_builtin):
+            while self.clock.dt < until:
+                self.clock.advance(self._tick())
+
+        return self.report
+
+
+def run_benchmark(amount=500, weeks=1, overlap=0.2, system_ratio=0.05, event_driven=True, seed=0) -> SimulationReport:
+
+    timers = generate_timers(amount, overlap=overlap,
+                             system_ratio=system_ratio, seed=seed)
+    return Simulation(timers, event_driven=event_driven).run(timedelta(weeks=weeks))
+
+
+if __name__ == "__main__":
+
+    # python -m resources.lib.test.simulation [amount] [weeks]
+    args = [int(a) for a in sys.argv[1:3]]
+    print(run_benchmark(*args))
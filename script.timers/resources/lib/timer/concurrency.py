@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import xbmcaddon
 import xbmcgui
-from resources.lib.player.player_utils import get_types_replaced_by_type
+from resources.lib.player.mediatype import get_types_replaced_by_type
 from resources.lib.timer.period import Period
 from resources.lib.timer.timer import (MEDIA_ACTION_START,
                                        MEDIA_ACTION_START_AT_END,
@@ -20,6 +20,91 @@ LOW_PRIO_MARK = -10
 HIGH_PRIO_MARK = 10
 DEFAULT_PRIO = 0
 
+_WEEK = int(timedelta(days=7).total_seconds())
+
+
+class PeriodIndex():
+
+    def __init__(self, timers: 'list[Timer]') -> None:
+
+        segments: 'list[tuple[int, int, int, Period]]' = list()
+        for i, t in enumerate(timers):
+            for p in t.periods:
+                for s, e in PeriodIndex._to_weekly_segments(p):
+                    segments.append((s, e, i, p))
+
+        self._timers = timers
+
+        segments.sort(key=lambda segment: segment[0])
+
+        self._starts = [segment[0] for segment in segments]
+        self._ends = [segment[1] for segment in segments]
+        self._items = [(segment[2], segment[3]) for segment in segments]
+
+        # implicit binary tree over sorted starts, each node knows max end of its subtree
+        self._max_ends = [0] * len(segments)
+        self._build(0, len(segments))
+
+    @staticmethod
+    def _to_weekly_segments(period: Period) -> 'list[tuple[int, int]]':
+
+        if period.by_date:
+            dt_start = period.start
+            monday = datetime(year=dt_start.year,
+                              month=dt_start.month, day=dt_start.day) - timedelta(days=dt_start.weekday())
+            start = int((dt_start - monday).total_seconds())
+
+        else:
+            start = period.start_secs % _WEEK
+
+        duration = period.end_secs - period.start_secs
+        if duration >= _WEEK:
+            return [(0, _WEEK)]
+
+        elif start + duration <= _WEEK:
+            return [(start, start + duration)]
+
+        else:
+            return [(start, _WEEK), (0, start + duration - _WEEK)]
+
+    def _build(self, lo: int, hi: int) -> int:
+
+        if lo >= hi:
+            return -1
+
+        mid = (lo + hi) // 2
+        self._max_ends[mid] = max(self._ends[mid], self._build(
+            lo, mid), self._build(mid + 1, hi))
+        return self._max_ends[mid]
+
+    def _query(self, lo: int, hi: int, start: int, end: int, result: 'list[int]') -> None:
+
+        if lo >= hi:
+            return
+
+        mid = (lo + hi) // 2
+        if self._max_ends[mid] < start:
+            return
+
+        self._query(lo, mid, start, end, result)
+        if self._starts[mid] <= end:
+            if self._ends[mid] >= start:
+                result.append(mid)
+
+            self._query(mid + 1, hi, start, end, result)
+
+    def find(self, period: Period) -> 'set[tuple[int, Period]]':
+
+        hits: 'list[int]' = list()
+        for s, e in PeriodIndex._to_weekly_segments(period):
+            self._query(0, len(self._starts), s, e, hits)
+
+        return set([self._items[i] for i in hits])
+
+    def get_timer(self, i: int) -> Timer:
+
+        return self._timers[i]
+
 
 def get_next_lower_prio(timers: 'list[Timer]') -> int:
 
@@ -35,12 +120,12 @@ def get_next_higher_prio(timers: 'list[Timer]') -> int:
     return _max + 1 if _max < HIGH_PRIO_MARK - 1 else _max
 
 
-def determine_overlappings(timer: Timer, timers: 'list[Timer]', base: datetime, ignore_extra_prio=False, to_display=False) -> 'list[Timer]':
+def determine_overlappings(timer: Timer, timers: 'list[Timer]', base: datetime, ignore_extra_prio=False, to_display=False, index: PeriodIndex = None) -> 'list[Timer]':
 
     def _is_exact_match(period1: Period, period2: Period, base: datetime) -> bool:
 
-        if type(period1.start) == type(period2.start):
-            return period1.start == period2.start and period1.end == period2.end
+        if period1.by_date == period2.by_date:
+            return period1.start_secs == period2.start_secs and period1.end_secs == period2.end_secs
 
         return _is_exact_match(Period.to_datetime_period(period1, base), Period.to_datetime_period(period2, base), base)
 
@@ -109,8 +194,19 @@ def determine_overlappings(timer: Timer, timers: 'list[Timer]', base: datetime,
 
     timer_replace_types = get_types_replaced_by_type(timer.media_type)
 
+    # periods can only disturb each other if they intersect within the week
+    if index is None:
+        index = PeriodIndex(timers)
+
+    candidates: 'set[tuple[Period, Period]]' = set()
+    candidate_timers: 'set[int]' = set()
+    for n in timer.periods:
+        for i, p in index.find(n):
+            candidates.add((p, n))
+            candidate_timers.add(i)
+
     overlapping_timers: 'list[Timer]' = list()
-    for t in timers:
+    for t in [index.get_timer(i) for i in sorted(candidate_timers)]:
 
         if t.id == timer.id or (ignore_extra_prio and (t.priority <= LOW_PRIO_MARK or t.priority >= HIGH_PRIO_MARK)):
             continue
@@ -122,7 +218,8 @@ def determine_overlappings(timer: Timer, timers: 'list[Timer]', base: datetime,
 
             for n in timer.periods:
 
-                if _disturbs(timer_replace_types, t.media_type, timer.media_action, t.media_action, n, p, base) or _disturbs(t_replace_types, timer.media_type, t.media_action, timer.media_action, p, n, base):
+                if (p, n) in candidates and (_disturbs(timer_replace_types, t.media_type, timer.media_action, t.media_action, n, p, base)
+                                             or _disturbs(t_replace_types, timer.media_type, t.media_action, timer.media_action, p, n, base)):
                     overlapping_periods.append(p)
 
         if overlapping_periods:
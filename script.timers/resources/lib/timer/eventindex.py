@@ -0,0 +1,95 @@
+import heapq
+from datetime import datetime
+
+from resources.lib.timer.timer import (STATE_ENDING, STATE_RUNNING,
+                                       STATE_STARTING, Timer)
+from resources.lib.utils import datetime_utils
+
+
+class EventIndex():
+
+    def __init__(self) -> None:
+
+        self._timers: 'list[Timer]' = None
+        self._size: int = 0
+        self._last_now: datetime = None
+
+        # min-heap of (upcoming event, index of timer)
+        self._heap: 'list[tuple[datetime, int]]' = list()
+        self._events: 'dict[int, datetime]' = dict()
+
+        self._running: 'set[int]' = set()
+        self._transitional: 'set[int]' = set()
+
+    def invalidate(self) -> None:
+
+        self._timers = None
+        self._size = 0
+        self._last_now = None
+        self._heap = list()
+        self._events = dict()
+        self._running = set()
+        self._transitional = set()
+
+    def apply(self, timers: 'list[Timer]', now: datetime_utils.DateTimeDelta) -> 'list[Timer]':
+
+        if (timers is not self._timers or len(timers) != self._size
+                or self._last_now is None or now.dt < self._last_now):
+            self.invalidate()
+            self._timers = timers
+            self._size = len(timers)
+            due = set(range(len(timers)))
+
+        else:
+            due = self._pop_due(now.dt)
+
+        self._last_now = now.dt
+
+        for i in due:
+            self._apply_timer(i, now)
+
+        return [self._timers[i] for i in sorted(due | self._running)]
+
+    def upcoming(self) -> 'tuple[datetime, Timer]':
+
+        while self._heap and self._events.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            return None, None
+
+        event, i = self._heap[0]
+        return event, self._timers[i]
+
+    def _pop_due(self, dt: datetime) -> 'set[int]':
+
+        due = set(self._transitional)
+        while self._heap and self._heap[0][0] <= dt:
+            event, i = heapq.heappop(self._heap)
+            if self._events.get(i) == event:
+                del self._events[i]
+                due.add(i)
+
+        return due
+
+    def _apply_timer(self, i: int, now: datetime_utils.DateTimeDelta) -> None:
+
+        timer = self._timers[i]
+        timer.apply(now)
+
+        if timer.state == STATE_RUNNING:
+            self._running.add(i)
+        else:
+            self._running.discard(i)
+
+        if timer.state in [STATE_STARTING, STATE_ENDING]:
+            self._transitional.add(i)
+        else:
+            self._transitional.discard(i)
+
+        if timer.upcoming_event is None:
+            self._events.pop(i, None)
+
+        elif self._events.get(i) != timer.upcoming_event:
+            self._events[i] = timer.upcoming_event
+            heapq.heappush(self._heap, (timer.upcoming_event, i))
@@ -0,0 +1,93 @@
+import bisect
+from datetime import datetime
+
+from resources.lib.timer.period import Period
+from resources.lib.timer.storage import Storage
+from resources.lib.timer.timer import Timer
+from resources.lib.utils import datetime_utils
+
+
+def get_expiry(timer: Timer) -> datetime:
+
+    # earliest moment when housekeeping may change or remove a timer, None if it never expires
+    if timer.is_weekly_timer() or timer.is_off() or not timer.periods:
+        return None
+
+    elif timer.date == "":
+        return datetime.min
+
+    base = datetime_utils.parse_date_str(timer.date)
+    return min(Period.to_datetime_period(p, base=base).end for p in timer.periods)
+
+
+class ExpiryIndex():
+
+    def __init__(self, storage: Storage) -> None:
+
+        self._storage = storage
+        self._key: list = None
+        self._offset = 0
+
+        # (expiry as ISO string, timer id) sorted by expiry
+        self._entries: 'list[tuple[str, int]]' = list()
+        self._expiries: 'dict[int, str]' = dict()
+
+    def load(self) -> None:
+
+        index = self._storage.load_expiry_index()
+        key, offset, changes = self._storage.load_changes_since(
+            index.get("storage"), index.get("journal"))
+
+        self._entries = list()
+        self._expiries = dict()
+        if changes is None:
+            # storage file has been rewritten, so index it from scratch
+            for timer in self._storage.load_timers_from_storage():
+                self.set(timer)
+
+        else:
+            for expiry, id in index.get("entries", list()):
+                self._expiries[id] = expiry
+                self._entries.append((expiry, id))
+
+            self._entries.sort()
+            for id, timer in changes.items():
+                if timer:
+                    self.set(timer)
+                else:
+                    self.remove(id)
+
+        self._key = key
+        self._offset = offset
+
+    def set(self, timer: Timer) -> None:
+
+        self.remove(timer.id)
+        expiry = get_expiry(timer)
+        if expiry:
+            self._expiries[timer.id] = expiry.isoformat()
+            bisect.insort(self._entries, (self._expiries[timer.id], timer.id))
+
+    def remove(self, id: int) -> None:
+
+        expiry = self._expiries.pop(id, None)
+        if expiry is not None:
+            self._entries.pop(bisect.bisect_left(self._entries, (expiry, id)))
+
+    def pop_expired(self, now: datetime) -> 'list[int]':
+
+        i = bisect.bisect_right(self._entries, (now.isoformat(), float("inf")))
+        expired = [id for _, id in self._entries[:i]]
+        del self._entries[:i]
+        for id in expired:
+            self._expiries.pop(id)
+
+        return expired
+
+    def save(self) -> None:
+
+        self._storage.save_expiry_index({
+            "storage": self._key,
+            "journal": self._offset,
+            "entries": self._entries
+        })
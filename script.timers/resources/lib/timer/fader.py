@@ -0,0 +1,185 @@
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+FADE_CURVE_LINEAR = 0
+FADE_CURVE_LOGARITHMIC = 1
+FADE_CURVE_PERCEPTUAL = 2
+
+# lower bound of a ramp step in seconds
+_MIN_STEP = 0.05
+
+
+def _apply_curve(curve: int, progress: float) -> float:
+
+    if curve == FADE_CURVE_LOGARITHMIC:
+        return math.log10(1 + 9 * progress)
+
+    elif curve == FADE_CURVE_PERCEPTUAL:
+        return progress * progress
+
+    else:
+        return progress
+
+
+def _invert_curve(curve: int, value: float) -> float:
+
+    if curve == FADE_CURVE_LOGARITHMIC:
+        return (math.pow(10, value) - 1) / 9
+
+    elif curve == FADE_CURVE_PERCEPTUAL:
+        return math.sqrt(value)
+
+    else:
+        return value
+
+
+class Ramp():
+
+    def __init__(self, start: datetime, end: datetime, vol_from: int, vol_to: int, curve=FADE_CURVE_LINEAR) -> None:
+
+        self.start = start
+        self.end = end
+        self.vol_from = vol_from
+        self.vol_to = vol_to
+        self.curve = curve
+
+    def __eq__(self, other: object) -> bool:
+
+        return isinstance(other, Ramp) and (self.start, self.end, self.vol_from, self.vol_to, self.curve) == (other.start, other.end, other.vol_from, other.vol_to, other.curve)
+
+    def _get_progress(self, now: datetime) -> float:
+
+        duration = (self.end - self.start).total_seconds()
+        if duration <= 0:
+            return 1.0
+
+        return min(1.0, max(0.0, (now - self.start).total_seconds() / duration))
+
+    def get_volume(self, now: datetime) -> int:
+
+        value = _apply_curve(self.curve, self._get_progress(now))
+        return int(round(self.vol_from + (self.vol_to - self.vol_from) * value, 0))
+
+    def get_next_change(self, now: datetime) -> datetime:
+
+        if self.vol_from == self.vol_to or now >= self.end:
+            return None
+
+        # the rounded volume changes as soon as the next half step is crossed
+        volume = self.get_volume(now)
+        direction = 1 if self.vol_to > self.vol_from else -1
+        value = (volume + direction * 0.5 - self.vol_from) / \
+            (self.vol_to - self.vol_from)
+        if value >= 1:
+            return self.end
+
+        progress = _invert_curve(self.curve, max(0.0, value))
+        return max(now, self.start + (self.end - self.start) * progress)
+
+    def __str__(self) -> str:
+
+        return "Ramp[%s-%s, %i->%i, curve=%i]" % (self.start, self.end, self.vol_from, self.vol_to, self.curve)
+
+
+class Fader():
+
+    def __init__(self, set_volume: 'callable') -> None:
+
+        self._set_volume = set_volume
+        self._lock = threading.Lock()
+
+        self._volume: int = None
+        self._ramp: Ramp = None
+        self._clock: 'tuple[datetime, float]' = None
+
+        self._threaded = False
+        self._thread: threading.Thread = None
+        self._stop_event: threading.Event = None
+
+    def set_threaded(self, threaded: bool) -> None:
+
+        self._threaded = threaded
+        if not threaded:
+            self._stop_thread()
+
+    def is_threaded(self) -> bool:
+
+        return self._threaded
+
+    def is_running(self) -> bool:
+
+        return self._thread is not None and self._thread.is_alive()
+
+    def fade(self, ramp: Ramp, now: datetime) -> None:
+
+        if ramp != self._ramp:
+            self._stop_thread()
+
+        with self._lock:
+            self._ramp = ramp
+            self._clock = (now, time.monotonic())
+
+        self._write(ramp.get_volume(now))
+
+        if self._threaded and not self.is_running() and ramp.get_next_change(now):
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stop_event,), daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+
+        self._stop_thread()
+        with self._lock:
+            self._ramp = None
+            self._clock = None
+
+        # volume may be changed by others as long as there is no fade
+        self.invalidate()
+
+    def invalidate(self) -> None:
+
+        with self._lock:
+            self._volume = None
+
+    def _stop_thread(self) -> None:
+
+        if self._stop_event:
+            self._stop_event.set()
+
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+        self._thread = None
+        self._stop_event = None
+
+    def _write(self, volume: int, stop_event: threading.Event = None) -> None:
+
+        with self._lock:
+            if stop_event and stop_event.is_set() or volume == self._volume:
+                return
+
+            self._volume = volume
+            self._set_volume(volume)
+
+    def _run(self, stop_event: threading.Event) -> None:
+
+        while True:
+            with self._lock:
+                if stop_event.is_set():
+                    break
+
+                ramp = self._ramp
+                synced_at, synced_mono = self._clock
+
+            # follow the scheduler's timeline which may have an offset to wall clock
+            now = synced_at + timedelta(seconds=time.monotonic() - synced_mono)
+            self._write(ramp.get_volume(now), stop_event)
+
+            next_change = ramp.get_next_change(now)
+            if not next_change:
+                break
+
+            stop_event.wait(max(_MIN_STEP, (next_change - now).total_seconds()))
@@ -2,95 +2,120 @@ from datetime import datetime, timedelta
 
 from resources.lib.utils import datetime_utils
 
+_EPOCH = datetime(1970, 1, 1)
+_WEEK = 7 * 86400
+
+
+def _to_secs(t: 'timedelta | datetime') -> int:
+
+    return int((t - _EPOCH if type(t) == datetime else t).total_seconds())
+
 
 class Period:
 
+    __slots__ = ("start_secs", "end_secs", "by_date")
+
     def __init__(self, start: 'timedelta | datetime', end: 'timedelta | datetime') -> None:
 
         if type(start) != type(end):
             raise Exception(
                 "types of <start> and <end> must be identically!!!")
 
-        self.start: 'timedelta | datetime' = start
-        self.end: 'timedelta | datetime' = end
+        self.by_date: bool = type(start) == datetime
+        self.start_secs: int = _to_secs(start)
+        self.end_secs: int = _to_secs(end)
 
-    def _compareByWeekdays(self, period_start: timedelta, period_end: timedelta) -> 'tuple[timedelta,timedelta,timedelta]':
+    @property
+    def start(self) -> 'timedelta | datetime':
 
-        self_start = self.start
-        self_end = self.end
-        week = timedelta(days=7)
+        return _EPOCH + timedelta(seconds=self.start_secs) if self.by_date else timedelta(seconds=self.start_secs)
 
-        if self_start > self_end and period_start <= period_end:
-            self_end += week
-            if period_end < self_start:
-                period_start += week
-                period_end += week
+    @property
+    def end(self) -> 'timedelta | datetime':
 
-        elif self_start <= self_end and period_start > period_end:
-            period_end += week
-            if self_end < period_start:
-                self_start += week
-                self_end += week
+        return _EPOCH + timedelta(seconds=self.end_secs) if self.by_date else timedelta(seconds=self.end_secs)
+
+    @staticmethod
+    def _compare_secs(self_start: int, self_end: int, period_start: int, period_end: int) -> 'tuple[timedelta,timedelta,timedelta]':
 
         max_start = max(self_start, period_start)
         min_end = min(self_end, period_end)
 
-        return self_start - period_start, self_end - period_end, min_end - max_start if max_start <= min_end else None
+        return timedelta(seconds=self_start - period_start), timedelta(seconds=self_end - period_end), timedelta(seconds=min_end - max_start) if max_start <= min_end else None
+
+    def _compareByWeekdays(self, period_start: int, period_end: int) -> 'tuple[timedelta,timedelta,timedelta]':
+
+        self_start = self.start_secs
+        self_end = self.end_secs
+
+        if self_start > self_end and period_start <= period_end:
+            self_end += _WEEK
+            if period_end < self_start:
+                period_start += _WEEK
+                period_end += _WEEK
+
+        elif self_start <= self_end and period_start > period_end:
+            period_end += _WEEK
+            if self_end < period_start:
+                self_start += _WEEK
+                self_end += _WEEK
 
-    def _compareByDates(self, period_start: datetime, period_end: datetime) -> 'tuple[timedelta,timedelta,timedelta]':
+        return Period._compare_secs(self_start, self_end, period_start, period_end)
 
-        max_start = max(self.start, period_start)
-        min_end = min(self.end, period_end)
+    def _compareByDates(self, period_start: int, period_end: int) -> 'tuple[timedelta,timedelta,timedelta]':
 
-        return self.start - period_start, self.end - period_end, min_end - max_start if max_start <= min_end else None
+        return Period._compare_secs(self.start_secs, self.end_secs, period_start, period_end)
 
     def compare(self, period: 'Period') -> 'tuple[timedelta,timedelta,timedelta]':
 
-        if type(self.start) != type(period.start):
+        if self.by_date != period.by_date:
             raise Exception(
                 f"can't compare {str(self)} with {str(period)} caused by different types")
 
-        if type(self.start) == timedelta:
-            return self._compareByWeekdays(period.start, period.end)
+        if not self.by_date:
+            return self._compareByWeekdays(period.start_secs, period.end_secs)
         else:
-            return self._compareByDates(period.start, period.end)
+            return self._compareByDates(period.start_secs, period.end_secs)
 
     def hit(self, timestamp: 'timedelta | datetime', base: datetime = None) -> 'tuple[timedelta,timedelta,bool]':
 
-        if type(self.start) == timedelta and type(timestamp) == timedelta:
-            s, e, l = self._compareByWeekdays(timestamp, timestamp)
+        if not self.by_date and type(timestamp) == timedelta:
+            secs = _to_secs(timestamp)
+            s, e, l = self._compareByWeekdays(secs, secs)
             return s, e, l is not None
-        elif type(self.start) == datetime and type(timestamp) == datetime:
-            s, e, l = self._compareByDates(timestamp, timestamp)
+        elif self.by_date and type(timestamp) == datetime:
+            secs = _to_secs(timestamp)
+            s, e, l = self._compareByDates(secs, secs)
             return s, e, l is not None
 
         if type(timestamp) == datetime:
             period = Period.to_datetime_period(
                 period=self, base=base or timestamp)
-            s, e, l = period._compareByDates(timestamp, timestamp)
+            secs = _to_secs(timestamp)
+            s, e, l = period._compareByDates(secs, secs)
             return s, e, l is not None
 
-        elif type(self.start) == datetime:
+        elif self.by_date:
             if not base:
                 raise ("This type of comparision requires a base-datetime")
 
-            timestamp = datetime_utils.apply_for_datetime(
-                base, timestamp, force_future=True)
-            s, e, l = self._compareByDates(timestamp, timestamp)
+            secs = _to_secs(datetime_utils.apply_for_datetime(
+                base, timestamp, force_future=True))
+            s, e, l = self._compareByDates(secs, secs)
             return s, e, l is not None
 
     def __str__(self) -> str:
 
-        start = self.start if type(
-            self.start) == timedelta else self.start.strftime("%Y-%m-%d %H:%M:%S")
-        end = self.end if type(self.end) == timedelta else self.end.strftime(
+        start = self.start if not self.by_date else self.start.strftime(
+            "%Y-%m-%d %H:%M:%S")
+        end = self.end if not self.by_date else self.end.strftime(
             "%Y-%m-%d %H:%M:%S")
         return f"Period[start={start}, end={end}]"
 
     @staticmethod
     def to_datetime_period(period: 'Period', base: datetime) -> 'Period':
 
-        if type(period.start) == datetime:
+        if period.by_date:
             return period
 
         start = datetime_utils.apply_for_datetime(base, period.start)
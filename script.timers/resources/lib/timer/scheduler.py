@@ -1,14 +1,17 @@
+import threading
 from datetime import datetime
 
 import xbmc
 import xbmcaddon
 import xbmcgui
 from resources.lib.player.player import Player
-from resources.lib.timer.concurrency import determine_overlappings
+from resources.lib.timer.concurrency import (PeriodIndex,
+                                             determine_overlappings)
 from resources.lib.timer.scheduleraction import SchedulerAction
 from resources.lib.timer.storage import Storage
 from resources.lib.timer.timer import (END_TYPE_DURATION, END_TYPE_TIME,
                                        STATE_WAITING, Timer)
+from resources.lib.utils import profiling_utils
 from resources.lib.utils.datetime_utils import (DateTimeDelta,
                                                 parse_datetime_str)
 from resources.lib.utils.settings_utils import (is_settings_changed_events,
@@ -19,6 +22,7 @@ from resources.lib.utils.system_utils import (is_fullscreen,
 
 CHECK_INTERVAL = 20
 MIN_INTERVAL = 1
+MAX_EVENT_DRIVEN_INTERVAL = 3600
 
 
 class Scheduler(xbmc.Monitor):
@@ -37,13 +41,18 @@ class Scheduler(xbmc.Monitor):
         self._disable_displayoff_on_audio = False
         self._windows_unlock = False
 
+        self._event_driven = False
+        self._wakeup = threading.Event()
+
         self._player = Player()
+        self._player.setWakeupListener(self.wakeup)
         _default_volume = xbmcaddon.Addon().getSettingInt("vol_default")
         self._player.setDefaultVolume(_default_volume)
         self._player.setVolume(_default_volume)
 
         self._storage = Storage()
         self.action = SchedulerAction(self._player, self._storage)
+        self.action.setFaderThreaded(True)
 
         self._storage.release_lock()
 
@@ -54,6 +63,22 @@ class Scheduler(xbmc.Monitor):
         if is_settings_changed_events():
             save_timer_from_settings()
             self._update()
+            self.wakeup()
+
+    def onNotification(self, sender: str, method: str, data: str) -> None:
+
+        if method == "System.OnWake":
+            self.wakeup()
+
+    def wakeup(self) -> None:
+
+        self._wakeup.set()
+
+    def _wakeup_on_abort(self) -> None:
+
+        # only waitForAbort() learns about every abort, e.g. if addon is disabled or updated
+        self.waitForAbort()
+        self.wakeup()
 
     def _update(self) -> None:
 
@@ -108,7 +133,7 @@ class Scheduler(xbmc.Monitor):
         def _reset_overlappings(timer: Timer) -> None:
 
             overlappings = determine_overlappings(
-                timer, scheduled_timers, base=datetime.today())
+                timer, scheduled_timers, base=now, index=index)
             for overlap in overlappings:
                 overlap.state = STATE_WAITING
 
@@ -139,6 +164,8 @@ class Scheduler(xbmc.Monitor):
         scheduled_timers = self._storage.get_scheduled_timers()
 
         if self._timers:
+            now = datetime.today()
+            index = PeriodIndex(scheduled_timers)
             _update_from_storage(scheduled_timers)
 
             ids = [t.id for t in scheduled_timers]
@@ -172,18 +199,27 @@ class Scheduler(xbmc.Monitor):
             "audio_displaysoff")
         self.reset_powermanagement_displaysoff()
 
+        self._event_driven = addon.getSettingBool("event_driven")
+        profiling_utils.set_enabled(addon.getSettingBool("profiling"))
+        self.action.setFadeCurve(addon.getSettingInt("fade_curve"))
+
     def start(self) -> None:
 
         prev_windows_unlock = False
 
+        threading.Thread(target=self._wakeup_on_abort, daemon=True).start()
+
         interval = CHECK_INTERVAL
         while not self.abortRequested():
 
+            self._wakeup.clear()
             now = DateTimeDelta.now(offset=self._offset)
+            profiling_utils.count("scheduler.wakeups")
 
             if self._pause_from and self._pause_until and now.dt >= self._pause_from and now.dt < self._pause_until:
 
                 interval = CHECK_INTERVAL - now.td.seconds % CHECK_INTERVAL
+                self.action.stopFader()
 
             elif self._timers:
 
@@ -207,15 +243,53 @@ class Scheduler(xbmc.Monitor):
                 prev_windows_unlock = set_windows_unlock(self._windows_unlock)
 
             self._prevent_powermanagement_displaysoff()
+            profiling_utils.dump_if_due()
+
+            if self._event_driven:
+                if self._wait_for_event(self._get_event_driven_wait(now)):
+                    break
+
+            else:
+                if self.waitForAbort(self._get_polling_wait(now, interval)):
+                    break
 
-            wait = min(CHECK_INTERVAL, interval if interval >= MIN_INTERVAL else MIN_INTERVAL, (
-                self.action.upcoming_event - now.dt).total_seconds() if self.action.upcoming_event else MIN_INTERVAL)
+    def _get_polling_wait(self, now: DateTimeDelta, interval: float) -> float:
 
-            if self.waitForAbort(wait):
-                break
+        return min(CHECK_INTERVAL, interval if interval >= MIN_INTERVAL else MIN_INTERVAL, (
+            self.action.upcoming_event - now.dt).total_seconds() if self.action.upcoming_event else MIN_INTERVAL)
+
+    def _get_event_driven_wait(self, now: DateTimeDelta) -> float:
+
+        waits = [MAX_EVENT_DRIVEN_INTERVAL]
+
+        if self._pause_from and self._pause_until and now.dt >= self._pause_from and now.dt < self._pause_until:
+            waits.append((self._pause_until - now.dt).total_seconds())
+
+        elif self._timers:
+            if self.action.upcoming_event:
+                waits.append(
+                    (self.action.upcoming_event - now.dt).total_seconds())
+
+            if self.action.fader:
+                waits.append(self.action.getFaderInterval() or CHECK_INTERVAL)
+
+        # there is no event if Kodi enters or leaves fullscreen mode
+        if self._powermanagement_displaysoff:
+            waits.append(CHECK_INTERVAL)
+
+        return max(MIN_INTERVAL, min(waits))
+
+    def _wait_for_event(self, timeout: float) -> bool:
+
+        # one blocking wait that is interrupted by wakeup() or an abort
+        self._wakeup.wait(timeout)
+        return self.abortRequested()
 
     def _prevent_powermanagement_displaysoff(self) -> None:
 
+        if not self._disabled_powermanagement_displaysoff and not self._powermanagement_displaysoff and not self._disable_displayoff_on_audio:
+            return
+
         fullscreen = is_fullscreen()
         audio = self._player.isPlayingAudio()
 
@@ -7,6 +7,8 @@ from resources.lib.player.mediatype import AUDIO, PICTURE, TYPES, VIDEO
 from resources.lib.player.player import Player
 from resources.lib.player.player_utils import (get_types_replaced_by_type,
                                                run_addon)
+from resources.lib.timer.eventindex import EventIndex
+from resources.lib.timer.fader import FADE_CURVE_LINEAR, Fader, Ramp
 from resources.lib.timer.notification import showNotification
 from resources.lib.timer.storage import Storage
 from resources.lib.timer.timer import (FADE_IN_FROM_MIN, FADE_OUT_FROM_CURRENT,
@@ -21,6 +23,7 @@ from resources.lib.timer.timer import (FADE_IN_FROM_MIN, FADE_OUT_FROM_CURRENT,
                                        SYSTEM_ACTION_SHUTDOWN_KODI,
                                        SYSTEM_ACTION_STANDBY, Timer)
 from resources.lib.utils import datetime_utils
+from resources.lib.utils.profiling_utils import count, profiled
 
 
 class SchedulerAction:
@@ -49,10 +52,17 @@ class SchedulerAction:
         self._endingTimers: 'list[Timer]' = None
         self._forceResumeResetTypes: 'list[str]' = None
 
+        self._eventIndex = EventIndex()
+
+        self._fader = Fader(self._player.setVolume)
+        self._player.setOnVolumeChanged(self._fader.invalidate)
+        self._fadeCurve = FADE_CURVE_LINEAR
+
         self.__is_unit_test__: bool = False
 
         self.reset()
 
+    @profiled("scheduler.calculate")
     def calculate(self, timers: 'list[Timer]', now: datetime_utils.DateTimeDelta) -> None:
 
         def _collectEndingTimer(timer: Timer) -> None:
@@ -77,8 +87,7 @@ class SchedulerAction:
 
         def _collectTimers(timers: 'list[Timer]', now: datetime_utils.DateTimeDelta) -> None:
 
-            for timer in timers:
-                timer.apply(now)
+            for timer in self._eventIndex.apply(timers, now):
 
                 if timer.state == STATE_STARTING:
                     self._beginningTimers.append(timer)
@@ -95,10 +104,7 @@ class SchedulerAction:
                         and (self.fader == None or self.fader.current_period.start > timer.current_period.start):
                     self.fader = timer
 
-                if timer.upcoming_event is not None:
-                    if self.upcoming_event is None or self.upcoming_event > timer.upcoming_event:
-                        self.upcoming_event = timer.upcoming_event
-                        self.upcoming_timer = timer
+            self.upcoming_event, self.upcoming_timer = self._eventIndex.upcoming()
 
         def _handleNestedStoppingTimer(timerToStop: Timer) -> None:
 
@@ -239,9 +245,22 @@ class SchedulerAction:
         else:
             self.timerToStopAV = timer
 
+    def setFadeCurve(self, curve: int) -> None:
+
+        self._fadeCurve = curve
+
+    def setFaderThreaded(self, threaded: bool) -> None:
+
+        self._fader.set_threaded(threaded)
+
+    def stopFader(self) -> None:
+
+        self._fader.stop()
+
     def getFaderInterval(self) -> float:
 
-        if not self.fader:
+        # a threaded fader runs its own timeline
+        if not self.fader or self._fader.is_threaded():
             return None
 
         delta_end_start = datetime_utils.datetime_diff(
@@ -268,23 +287,17 @@ class SchedulerAction:
         if not self.fader:
             return
 
-        delta_now_start = datetime_utils.datetime_diff(
-            dtd.dt, self.fader.current_period.start)
-        delta_end_start = datetime_utils.time_diff(
-            self.fader.current_period.end, self.fader.current_period.start)
-        delta_percent = delta_now_start / delta_end_start
-
         vol_max = self.fader.return_vol if self.fader.fade == FADE_OUT_FROM_CURRENT else self.fader.vol_max
-        vol_diff = vol_max - self.fader.vol_min
 
         if self.fader.fade == FADE_IN_FROM_MIN:
-            _volume = int(round(self.fader.vol_min +
-                          vol_diff * delta_percent, 0))
+            vol_from, vol_to = self.fader.vol_min, vol_max
         else:
-            _volume = int(round(vol_max - vol_diff * delta_percent, 0))
+            vol_from, vol_to = vol_max, self.fader.vol_min
 
-        self._player.setVolume(_volume)
+        self._fader.fade(Ramp(start=self.fader.current_period.start, end=self.fader.current_period.end,
+                              vol_from=vol_from, vol_to=vol_to, curve=self._fadeCurve), dtd.dt)
 
+    @profiled("scheduler.perform")
     def perform(self, now: datetime_utils.DateTimeDelta) -> None:
 
         def _performPlayerAction(_now: datetime_utils.DateTimeDelta) -> None:
@@ -323,17 +336,22 @@ class SchedulerAction:
         def _setVolume(dtd: datetime_utils.DateTimeDelta) -> None:
 
             if self.timerWithSystemAction:
+                self._fader.stop()
                 self._player.setVolume(self._player.getDefaultVolume())
                 return
 
-            else:
+            elif self.fader:
                 self.fade(dtd)
 
+            else:
+                self._fader.stop()
+
             ending_faders = [
                 t for t in self._endingTimers if t.is_fading_timer()]
             if ending_faders:
                 self._player.setVolume(
                     max(ending_faders, key=lambda t: t.return_vol).return_vol)
+                self._fader.invalidate()
 
         def _consumeSingleRunTimers() -> None:
 
@@ -351,9 +369,18 @@ class SchedulerAction:
                             timer.to_timer_by_date(base=now.dt)
                             self.storage.save_timer(timer=timer)
 
-            _reset(self._endingTimers)
-            if self.timerWithSystemAction:
-                _reset(self._runningTimers)
+            # all changes of this event are written at once
+            self.storage.begin()
+            try:
+                _reset(self._endingTimers)
+                if self.timerWithSystemAction:
+                    _reset(self._runningTimers)
+
+            except:
+                self.storage.rollback()
+                raise
+
+            self.storage.commit()
 
         def _runScripts() -> None:
 
@@ -407,6 +434,7 @@ class SchedulerAction:
                 t.state = STATE_WAITING
 
         if self.hasEventToPerform:
+            count("scheduler.events")
             _performPlayerAction(now)
 
         _setVolume(now)
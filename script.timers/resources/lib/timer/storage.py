@@ -1,79 +1,179 @@
+import copy
 import json
 import os
-import random
-import time
 
 import xbmc
 import xbmcaddon
 import xbmcvfs
 from resources.lib.timer.timer import STATE_WAITING, Timer
+from resources.lib.utils.lock_utils import FileLock, get_lock
+from resources.lib.utils.profiling_utils import profiled
+
+_JOURNAL_OP_SAVE = "save"
+_JOURNAL_OP_DELETE = "delete"
+_JOURNAL_MAX_SIZE = 64 * 1024
 
 
 class Storage():
 
+    # parsed timers shared by all instances within the same process
+    _cache_key: 'tuple' = None
+    _cache_timers: 'list[Timer]' = None
+
+    # profile path doesn't change, so an addon handle is created only once per process
+    _storage_path: str = None
+
+    def __init__(self) -> None:
+
+        # journal entries of an open batch, None if mutations are written at once
+        self._batch: 'list[dict]' = None
+
     def _get_storage_path(self) -> str:
 
-        addon = xbmcaddon.Addon()
-        profile_path = xbmcvfs.translatePath(addon.getAddonInfo('profile'))
-        return os.path.join(profile_path, "timers.json")
+        if Storage._storage_path is None:
+            addon = xbmcaddon.Addon()
+            profile_path = xbmcvfs.translatePath(
+                addon.getAddonInfo('profile'))
+            Storage._storage_path = os.path.join(profile_path, "timers.json")
 
-    def _aquire_lock(self) -> str:
+        return Storage._storage_path
 
-        lock_path = "%s.lck" % self._get_storage_path()
-        lock = str(int(time.time()))
+    def _get_journal_path(self) -> str:
 
-        with xbmcvfs.File(lock_path, "w") as file:
-            file.write(lock)
+        return "%s.journal" % self._get_storage_path()
 
-        return lock
+    def _get_expiry_index_path(self) -> str:
 
-    def release_lock(self) -> None:
+        return "%s.expiry" % self._get_storage_path()
 
-        lock_file = "%s.lck" % self._get_storage_path()
-        if xbmcvfs.exists(lock_file):
-            xbmcvfs.rmdir(lock_file, force=True)
+    def _get_cache_key(self) -> 'tuple':
 
-    def _wait_for_unlock(self) -> None:
+        def _stat(path: str) -> 'tuple[int, int]':
 
-        lock_path = "%s.lck" % self._get_storage_path()
+            try:
+                stat = os.stat(path)
+                return stat.st_size, stat.st_mtime_ns
+            except OSError:
+                return None
 
-        wait = 5
-        while xbmcvfs.exists(lock_path) and wait > 0:
+        return _stat(self._get_storage_path()), _stat(self._get_journal_path())
 
-            xbmc.sleep(100 + int(random.random() * 100))
-            wait -= 1
+    def _invalidate_cache(self) -> None:
 
-        if wait == 0:
-            xbmc.log("[script.timers] %s is locked. Unlock now with small risk of data loss." %
-                     self._get_storage_path(), xbmc.LOGWARNING)
-            self.release_lock()
+        Storage._cache_key = None
+        Storage._cache_timers = None
 
-    def _load_from_storage(self) -> 'list[dict]':
+    def _copy_timer(self, timer: Timer) -> Timer:
+
+        _timer = copy.copy(timer)
+        _timer.days = list(timer.days)
+        _timer.periods = list(timer.periods)
+        return _timer
 
-        self._wait_for_unlock()
+    def _get_lock(self) -> FileLock:
+
+        return get_lock("%s.lck" % self._get_storage_path())
+
+    def release_lock(self) -> None:
+
+        self._get_lock().break_stale_lock()
+
+    @profiled("storage.load")
+    def _load_from_storage(self) -> 'list[dict]':
 
         storage_path = self._get_storage_path()
         _storage = list()
-        if xbmcvfs.exists(storage_path):
-            with xbmcvfs.File(storage_path, "r") as file:
-                try:
-                    _storage.extend(json.load(file))
-                except:
-                    # this should normally not be a problem, but it fails when running unit tests
-                    xbmc.log("[script.timers] Can't read timers from storage.",
-                             xbmc.LOGWARNING)
+        with self._get_lock():
+            if xbmcvfs.exists(storage_path):
+                with xbmcvfs.File(storage_path, "r") as file:
+                    try:
+                        _storage.extend(json.load(file))
+                    except:
+                        # this should normally not be a problem, but it fails when running unit tests
+                        xbmc.log("[script.timers] Can't read timers from storage.",
+                                 xbmc.LOGWARNING)
+
+            entries = self._load_journal()
+
+        return self._apply_journal(_storage, entries)
+
+    def _load_journal(self, offset=0) -> 'list[dict]':
+
+        journal_path = self._get_journal_path()
+        entries = list()
+        if os.path.isfile(journal_path):
+            with open(journal_path, "r", encoding="utf-8") as file:
+                file.seek(offset)
+                for line in file:
+                    try:
+                        entries.append(json.loads(line))
+                    except:
+                        # last entry may be incomplete if Kodi has crashed while writing
+                        xbmc.log("[script.timers] Skip broken entry in journal of storage.",
+                                 xbmc.LOGWARNING)
+
+        return entries
+
+    def _apply_journal(self, storage: 'list[dict]', entries: 'list[dict]') -> 'list[dict]':
+
+        if not entries:
+            return storage
+
+        items = {item["id"]: item for item in storage}
+        for entry in entries:
+            if entry["op"] == _JOURNAL_OP_SAVE:
+                items[entry["item"]["id"]] = entry["item"]
+
+            elif entry["op"] == _JOURNAL_OP_DELETE and entry["id"] in items:
+                items.pop(entry["id"])
+
+        storage = list(items.values())
+        storage.sort(key=lambda item: item["id"])
+        return storage
+
+    @profiled("storage.append")
+    def _append_to_journal(self, entries: 'list[dict]') -> None:
 
-        return _storage
+        journal_path = self._get_journal_path()
 
+        with self._get_lock():
+            cache_valid = Storage._cache_timers is not None and Storage._cache_key == self._get_cache_key()
+            with open(journal_path, "a", encoding="utf-8") as file:
+                for entry in entries:
+                    file.write("%s\n" % json.dumps(obj=entry, sort_keys=True))
+
+            if cache_valid:
+                self._apply_journal_to_cache(entries)
+            else:
+                self._invalidate_cache()
+
+            # compact within the same lock so that no other writer gets lost
+            if os.path.getsize(journal_path) > _JOURNAL_MAX_SIZE:
+                self._save_to_storage(self._load_from_storage())
+
+    def _apply_journal_to_cache(self, entries: 'list[dict]') -> None:
+
+        timers = {timer.id: timer for timer in Storage._cache_timers}
+        for entry in entries:
+            if entry["op"] == _JOURNAL_OP_SAVE:
+                timers[entry["item"]["id"]] = self._init_timer_from_item(
+                    entry["item"])
+
+            elif entry["op"] == _JOURNAL_OP_DELETE:
+                timers.pop(entry["id"], None)
+
+        Storage._cache_timers = sorted(
+            timers.values(), key=lambda timer: timer.id)
+        Storage._cache_key = self._get_cache_key()
+
+    @profiled("storage.save")
     def _save_to_storage(self, storage: 'list[dict]') -> None:
 
         storage.sort(key=lambda item: item["id"])
         storage_path = self._get_storage_path()
 
-        self._wait_for_unlock()
-        try:
-            lock = self._aquire_lock()
-            tmp = "%s.%s" % (storage_path, lock)
+        with self._get_lock():
+            tmp = "%s.tmp" % storage_path
             old = "%s.old" % storage_path
             with xbmcvfs.File(tmp, "w") as file:
                 json.dump(obj=storage, fp=file, indent=2, sort_keys=True)
@@ -84,24 +184,88 @@ class Storage():
             xbmcvfs.rename(storage_path, old)
             xbmcvfs.rename(tmp, storage_path)
 
-        finally:
-            self.release_lock()
+            # journal has been merged into storage
+            if xbmcvfs.exists(self._get_journal_path()):
+                xbmcvfs.delete(self._get_journal_path())
+
+            self._invalidate_cache()
+
+    def load_changes_since(self, key: list, offset: int) -> 'tuple[list, int, dict[int, Timer]]':
+
+        # timers saved or deleted (None) in journal after offset as long as the storage
+        # file is still the one of key. Otherwise changes are None
+        with self._get_lock():
+            storage_stat, journal_stat = self._get_cache_key()
+            _key = list(storage_stat) if storage_stat else None
+            _offset = journal_stat[0] if journal_stat else 0
+            if _key is None or _key != key or offset is None or _offset < offset:
+                return _key, _offset, None
+
+            entries = self._load_journal(offset) if _offset > offset else list()
+
+        changes = dict()
+        for entry in entries:
+            if entry["op"] == _JOURNAL_OP_SAVE:
+                changes[entry["item"]["id"]] = self._init_timer_from_item(
+                    entry["item"])
+
+            elif entry["op"] == _JOURNAL_OP_DELETE:
+                changes[entry["id"]] = None
+
+        return _key, _offset, changes
+
+    def load_expiry_index(self) -> dict:
+
+        index_path = self._get_expiry_index_path()
+        if not os.path.isfile(index_path):
+            return dict()
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+
+        except (OSError, ValueError):
+            xbmc.log("[script.timers] Can't read expiry index of storage, rebuild it.",
+                     xbmc.LOGWARNING)
+            return dict()
+
+    def save_expiry_index(self, index: dict) -> None:
+
+        index_path = self._get_expiry_index_path()
+        tmp = "%s.tmp" % index_path
+        try:
+            with open(tmp, "w", encoding="utf-8") as file:
+                json.dump(obj=index, fp=file)
+
+            os.replace(tmp, index_path)
+
+        except OSError:
+            xbmc.log("[script.timers] Can't write expiry index of storage.",
+                     xbmc.LOGWARNING)
 
     def load_timers_from_storage(self) -> 'list[Timer]':
 
+        key = self._get_cache_key()
+        if key is not None and key == Storage._cache_key and Storage._cache_timers is not None:
+            return [self._copy_timer(timer) for timer in Storage._cache_timers]
+
         timers = list()
         storage = self._load_from_storage()
         for item in storage:
             timers.append(self._init_timer_from_item(item))
 
+        if key is not None:
+            Storage._cache_key = key
+            Storage._cache_timers = [
+                self._copy_timer(timer) for timer in timers]
+
         return timers
 
     def load_timer_from_storage(self, id: int) -> Timer:
 
-        storage = self._load_from_storage()
-        for item in storage:
-            if item["id"] == id:
-                return self._init_timer_from_item(item)
+        for timer in self.load_timers_from_storage():
+            if timer.id == id:
+                return timer
 
         return None
 
@@ -143,39 +307,42 @@ class Storage():
 
         return timer
 
-    def _find_item_index(self, storage: 'list[dict]', id: int) -> int:
-
-        for i, item in enumerate(storage):
-            if item["id"] == id:
-                return i
-
-        return -1
-
     def replace_storage(self, timers: 'list[Timer]') -> None:
 
         storage = [timer.to_dict() for timer in timers]
         self._save_to_storage(storage)
 
-    def save_timer(self, timer: Timer) -> None:
+    def begin(self) -> None:
 
-        storage = self._load_from_storage()
+        if self._batch is None:
+            self._batch = list()
 
-        timer.init()
-        idx = self._find_item_index(storage, timer.id)
-        if idx == -1:
-            storage.append(timer.to_dict())
+    def commit(self) -> None:
+
+        entries = self._batch
+        self._batch = None
+        if entries:
+            self._append_to_journal(entries)
+
+    def rollback(self) -> None:
+
+        self._batch = None
+
+    def _write(self, entry: dict) -> None:
+
+        if self._batch is not None:
+            self._batch.append(entry)
         else:
-            storage[idx] = timer.to_dict()
+            self._append_to_journal([entry])
 
-        self._save_to_storage(storage)
+    def save_timer(self, timer: Timer) -> None:
+
+        timer.init()
+        self._write({"op": _JOURNAL_OP_SAVE, "item": timer.to_dict()})
 
     def delete_timer(self, timer_id: int) -> None:
 
-        storage = self._load_from_storage()
-        idx = self._find_item_index(storage, timer_id)
-        if idx >= 0:
-            storage.pop(idx)
-            self._save_to_storage(storage=storage)
+        self._write({"op": _JOURNAL_OP_DELETE, "id": timer_id})
 
     def get_scheduled_timers(self) -> 'list[Timer]':
 
@@ -187,10 +354,10 @@ class Storage():
 
     def get_next_id(self) -> int:
 
-        storage = self._load_from_storage()
+        timers = self.load_timers_from_storage()
 
         next_id = 0
-        if storage:
-            next_id = max(storage, key=lambda item: item["id"])["id"] + 1
+        if timers:
+            next_id = max(timers, key=lambda timer: timer.id).id + 1
 
         return next_id
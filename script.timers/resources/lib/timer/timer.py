@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 import xbmcaddon
 from resources.lib.timer.period import Period
@@ -41,12 +42,58 @@ STATE_STARTING = 1
 STATE_RUNNING = 2
 STATE_ENDING = 3
 
+_DAY = 86400
+_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _compile_times(start: str, start_offset: int, end_type: int, end: str, end_offset: int) -> 'tuple[int, int]':
+
+    # returns start and end in seconds relative to midnight of the starting day,
+    # <end> is either the duration or the end time depending on <end_type>
+    i_start = (int(datetime_utils.parse_time(start).total_seconds()) +
+               start_offset) % _DAY
+
+    if end_type == END_TYPE_DURATION:
+        i_end = i_start + \
+            int(datetime_utils.parse_time(end).total_seconds()) + end_offset
+
+    elif end_type == END_TYPE_TIME:
+        i_end = int(datetime_utils.parse_time(
+            end).total_seconds()) + end_offset
+        if i_end < i_start:
+            i_end += _DAY
+
+    else:  # END_TYPE_NO
+        i_end = i_start + 1
+
+    return i_start, i_end
+
+
+@lru_cache(maxsize=_CACHE_SIZE * 7)
+def _build_weekday_period(day: int, start: int, end: int) -> Period:
+
+    # periods are never modified in place, so they can be shared by timers
+    return Period(timedelta(seconds=day * _DAY + start), timedelta(seconds=day * _DAY + end))
+
+
+def _build_date_period(date: str, start: int, end: int) -> Period:
+
+    dt_date = datetime_utils.parse_date_str(date)
+    return Period(dt_date + timedelta(seconds=start), dt_date + timedelta(seconds=end))
+
 
 class Timer():
 
-    def __init__(self, i: int) -> None:
+    __slots__ = ("id", "label", "days", "date", "start", "start_offset", "end_type", "duration", "duration_offset",
+                 "end", "end_offset", "system_action", "media_action", "path", "media_type", "repeat", "shuffle",
+                 "resume", "fade", "vol_min", "vol_max", "notify", "priority",
+                 "periods", "duration_timedelta", "state", "current_period", "upcoming_event", "return_vol")
 
-        self._addon = xbmcaddon.Addon()
+    # created on first use since only formatting requires localized strings
+    _shared_addon: xbmcaddon.Addon = None
+
+    def __init__(self, i: int) -> None:
 
         # master data
         self.id: int = i
@@ -81,109 +128,68 @@ class Timer():
         self.upcoming_event: datetime = None
         self.return_vol: int = None
 
-    def init(self) -> None:
+    @property
+    def _addon(self) -> xbmcaddon.Addon:
 
-        def _build_end_time(start: 'timedelta | datetime', end_type: int, duration_timedelta: timedelta, end: str, end_offset=0, duration_offset=0) -> 'tuple[timedelta | datetime, timedelta | datetime]':
-
-            if end_type == END_TYPE_DURATION:
-                end_time = start + duration_timedelta + \
-                    timedelta(seconds=duration_offset)
-
-            elif end_type == END_TYPE_TIME:
-
-                end_time = datetime_utils.parse_time(
-                    end) + timedelta(seconds=end_offset)
-                if type(start) == datetime:
-                    end_time = datetime(year=start.year, month=start.month, day=start.day,
-                                        hour=int(
-                                            end_time.total_seconds() // 3600),
-                                        minute=int(
-                                            end_time.total_seconds() % 3600) // 60,
-                                        second=int(end_time.total_seconds() % 60))
-                else:
-                    end_time = end_time + timedelta(days=start.days)
-
-                if end_time < start:
-                    end_time += timedelta(days=1)
-
-            else:  # END_TYPE_NO
-                end_time = start + timedelta(seconds=1)
-
-            return end_time, end_time - start
-
-        td_start = datetime_utils.parse_time(self.start) + \
-            timedelta(seconds=self.start_offset)
-        self.start = datetime_utils.format_from_seconds(td_start.seconds)
-        self.start_offset = td_start.seconds % 60
-
-        td_end, td_duration = _build_end_time(
-            start=td_start, end_type=self.end_type, duration_timedelta=datetime_utils.parse_time(
-                self.duration),
-            end=self.end,
-            end_offset=self.end_offset,
-            duration_offset=self.duration_offset)
-        self.end = datetime_utils.format_from_seconds(td_end.seconds)
-        self.end_offset = td_end.seconds % 60
-        self.duration = datetime_utils.format_from_seconds(td_duration.seconds)
-        self.duration_offset = td_duration.seconds % 60
-        self.duration_timedelta = td_duration
+        if Timer._shared_addon is None:
+            Timer._shared_addon = xbmcaddon.Addon()
 
-        if self.is_weekly_timer():
-            self.date = ""
+        return Timer._shared_addon
 
-        if self.is_timer_by_date():
+    def init(self) -> None:
 
-            self.days = [TIMER_BY_DATE]
-            dt_start = datetime_utils.parse_datetime_str(
-                f"{self.date} {self.start}") + timedelta(seconds=self.start_offset)
-            dt_end, self.duration_timedelta = _build_end_time(start=dt_start,
-                                                              end_type=self.end_type,
-                                                              duration_timedelta=self.duration_timedelta,
-                                                              end=self.end,
-                                                              end_offset=self.end_offset,
-                                                              duration_offset=self.duration_offset)
+        if self.end_type == END_TYPE_DURATION:
+            start, end = _compile_times(
+                self.start, self.start_offset, self.end_type, self.duration, self.duration_offset)
 
-            self.periods = [Period(dt_start, dt_end)]
+        elif self.end_type == END_TYPE_TIME:
+            start, end = _compile_times(
+                self.start, self.start_offset, self.end_type, self.end, self.end_offset)
 
         else:
-            periods = list()
-            for i_day in self.days:
-                if i_day == TIMER_WEEKLY:
-                    continue
+            start, end = _compile_times(
+                self.start, self.start_offset, self.end_type, "", 0)
 
-                td_start = datetime_utils.parse_time(self.start, i_day) + \
-                    timedelta(seconds=self.start_offset)
-                td_end, self.duration_timedelta = _build_end_time(start=td_start,
-                                                                  end_type=self.end_type,
-                                                                  duration_timedelta=self.duration_timedelta,
-                                                                  end=self.end,
-                                                                  end_offset=self.end_offset,
-                                                                  duration_offset=self.duration_offset)
+        self.start = datetime_utils.format_from_seconds(start)
+        self.start_offset = start % 60
+        self.end = datetime_utils.format_from_seconds(end % _DAY)
+        self.end_offset = end % 60
+        self.duration = datetime_utils.format_from_seconds((end - start) % _DAY)
+        self.duration_offset = (end - start) % 60
+        self.duration_timedelta = timedelta(seconds=end - start)
 
-                periods.append(Period(td_start, td_end))
+        if self.is_weekly_timer():
+            self.date = ""
 
-            self.periods = periods
+        if self.is_timer_by_date():
+            self.days = [TIMER_BY_DATE]
+            self.periods = [_build_date_period(self.date, start, end)]
+
+        else:
+            self.periods = [_build_weekday_period(d, start, end)
+                            for d in self.days if d != TIMER_WEEKLY]
 
     def _apply_weekday_periods(self, dtd: datetime_utils.DateTimeDelta) -> 'tuple[Period, datetime]':
 
-        td_upcoming_event: timedelta = None
+        secs = int(dtd.td.total_seconds())
+        secs_upcoming_event: int = None
         current_period: Period = None
 
         for period in self.periods:
 
-            if period.start > dtd.td:
-                td_upcoming_event = period.start if td_upcoming_event is None or td_upcoming_event > period.start else td_upcoming_event
+            if period.start_secs > secs:
+                secs_upcoming_event = period.start_secs if secs_upcoming_event is None or secs_upcoming_event > period.start_secs else secs_upcoming_event
 
-            elif dtd.td < period.end:
+            elif secs < period.end_secs:
                 current_period = period
-                td_upcoming_event = period.end
+                secs_upcoming_event = period.end_secs
                 break
 
-        if not td_upcoming_event and self.periods:
-            td_upcoming_event = self.periods[0].start + timedelta(days=7)
+        if not secs_upcoming_event and self.periods:
+            secs_upcoming_event = self.periods[0].start_secs + 7 * _DAY
 
         upcoming_event = datetime_utils.apply_for_datetime(
-            dtd.dt, td_upcoming_event) if dtd.dt else None
+            dtd.dt, timedelta(seconds=secs_upcoming_event)) if dtd.dt else None
 
         return Period.to_datetime_period(current_period, base=dtd.dt) if current_period else None, upcoming_event
 
@@ -2,6 +2,7 @@ from datetime import datetime
 
 import xbmc
 import xbmcaddon
+from resources.lib.timer.expiryindex import ExpiryIndex
 from resources.lib.timer.storage import Storage
 from resources.lib.timer.timer import TIMER_BY_DATE, Timer
 from resources.lib.utils import datetime_utils
@@ -16,7 +17,6 @@ def check_timer(timer: Timer, threshold: datetime) -> int:
     if timer.is_weekly_timer() or timer.is_off():
         return ACTION_NOTHING
 
-    timer.init()
     timer.apply(dtd=datetime_utils.DateTimeDelta(threshold))
     if timer.date == "":
         timer.to_timer_by_date(timer.upcoming_event)
@@ -56,22 +56,36 @@ def cleanup_outdated_timers() -> None:
         return
 
     storage = Storage()
-    timers = storage.load_timers_from_storage()
-
-    updated_any = False
-    timers_to_remove = list()
+    index = ExpiryIndex(storage)
+    index.load()
 
+    # only timers that may have expired since last run are checked
     now = datetime.today()
-    for timer in timers:
-        action = check_timer(timer, now)
-        if action == ACTION_UPDATE:
-            updated_any = True
-        elif action == ACTION_DELETE:
-            timers_to_remove.append(timer)
-
-    for timer in timers_to_remove:
-        xbmc.log(f"remove outdated timer: {str(timer)}", xbmc.LOGINFO)
-        timers.remove(timer)
-
-    if updated_any or timers_to_remove:
-        storage.replace_storage(timers)
+    expired = index.pop_expired(now)
+    if expired:
+        timers = {
+            timer.id: timer for timer in storage.load_timers_from_storage()}
+        storage.begin()
+        try:
+            for timer in [timers[id] for id in expired if id in timers]:
+                stored = timer.to_dict()
+                action = check_timer(timer, now)
+                if action == ACTION_DELETE:
+                    xbmc.log(f"remove outdated timer: {str(timer)}", xbmc.LOGINFO)
+                    storage.delete_timer(timer.id)
+                    continue
+
+                # check_timer may also move the date of timers that are kept as they are,
+                # so persist it since the index must refer to what has been stored
+                if action == ACTION_UPDATE or timer.to_dict() != stored:
+                    storage.save_timer(timer=timer)
+
+                index.set(timer)
+
+        except:
+            storage.rollback()
+            raise
+
+        storage.commit()
+
+    index.save()
@@ -1,10 +1,14 @@
+import itertools
 import json
-import time
 
 import xbmc
+from resources.lib.utils.profiling_utils import count, measure
 
+# next() on itertools.count is atomic, so ids are unique across threads
+_ids = itertools.count(1)
 
-def json_rpc(jsonmethod: str, params=None) -> dict:
+
+def _build_request(jsonmethod: str, params=None) -> dict:
 
     kodi_json = {}
 
@@ -15,8 +19,43 @@ def json_rpc(jsonmethod: str, params=None) -> dict:
         params = {}
 
     kodi_json["params"] = params
-    kodi_json["id"] = int(time.time() * 1000)
+    kodi_json["id"] = next(_ids)
+
+    return kodi_json
 
-    json_response = xbmc.executeJSONRPC(json.dumps(kodi_json))
+
+def json_rpc(jsonmethod: str, params=None) -> dict:
+
+    kodi_json = _build_request(jsonmethod, params)
+
+    with measure("json_rpc.%s" % jsonmethod):
+        json_response = xbmc.executeJSONRPC(json.dumps(kodi_json))
     json_object = json.loads(json_response)
     return json_object["result"] if "result" in json_object else None
+
+
+def json_rpc_batch(calls: 'list[tuple[str, dict]]') -> 'list[dict]':
+
+    if not calls:
+        return list()
+
+    elif len(calls) == 1:
+        return [json_rpc(*calls[0])]
+
+    kodi_json = [_build_request(*call) for call in calls]
+
+    for request in kodi_json:
+        count("json_rpc_batch.%s" % request["method"])
+
+    with measure("json_rpc_batch"):
+        json_response = xbmc.executeJSONRPC(json.dumps(kodi_json))
+    json_object = json.loads(json_response)
+
+    # responses of a batch may arrive in any order
+    results = dict()
+    if type(json_object) == list:
+        for response in json_object:
+            if "id" in response and "result" in response:
+                results[response["id"]] = response["result"]
+
+    return [results.get(request["id"]) for request in kodi_json]
@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+
+import xbmc
+
+try:
+    import fcntl
+except ImportError:
+    # e.g. MS Windows, fallback to exclusively created lock files
+    fcntl = None
+
+_STALE_LOCK_SECS = 10
+_RETRY_INTERVAL_MS = 50
+
+_locks: 'dict[str, FileLock]' = dict()
+_locks_guard = threading.Lock()
+
+
+class FileLock():
+
+    def __init__(self, path: str) -> None:
+
+        self.path = path
+        self._fd: int = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+
+    def acquire(self, blocking=True) -> bool:
+
+        if not self._thread_lock.acquire(blocking=blocking):
+            return False
+
+        if self._depth == 0:
+            try:
+                locked = self._lock_file(blocking)
+            except:
+                self._thread_lock.release()
+                raise
+
+            if not locked:
+                self._thread_lock.release()
+                return False
+
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_file()
+
+        self._thread_lock.release()
+
+    def break_stale_lock(self) -> None:
+
+        # advisory locks are released by the OS if the owning process has died
+        if not fcntl and self._depth == 0 and os.path.exists(self.path):
+            xbmc.log("[script.timers] remove stale lock %s" %
+                     self.path, xbmc.LOGINFO)
+            os.remove(self.path)
+
+    def _lock_file(self, blocking: bool) -> bool:
+
+        if fcntl:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+
+            self._fd = fd
+            return True
+
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_WRONLY |
+                                   os.O_CREAT | os.O_EXCL)
+                os.write(self._fd, str(os.getpid()).encode())
+                return True
+
+            except FileExistsError:
+                if self._is_stale():
+                    xbmc.log("[script.timers] %s is locked for more than %i seconds. Unlock now." %
+                             (self.path, _STALE_LOCK_SECS), xbmc.LOGWARNING)
+                    self._remove_lock_file()
+
+                elif not blocking:
+                    return False
+
+                else:
+                    xbmc.sleep(_RETRY_INTERVAL_MS)
+
+    def _unlock_file(self) -> None:
+
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+
+        else:
+            os.close(self._fd)
+            self._remove_lock_file()
+
+        self._fd = None
+
+    def _is_stale(self) -> bool:
+
+        try:
+            return time.time() - os.path.getmtime(self.path) > _STALE_LOCK_SECS
+        except OSError:
+            return False
+
+    def _remove_lock_file(self) -> None:
+
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> 'FileLock':
+
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+
+        self.release()
+
+
+def get_lock(path: str) -> FileLock:
+
+    with _locks_guard:
+        if path not in _locks:
+            _locks[path] = FileLock(path)
+
+        return _locks[path]
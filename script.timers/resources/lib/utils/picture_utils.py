@@ -1,54 +1,102 @@
-import os
-from random import uniform
+import time
+from random import randrange, uniform
 
-import xbmcvfs
+from resources.lib.player.mediaindex import MediaIndex
 from resources.lib.player.mediatype import PICTURE
 from resources.lib.utils import vfs_utils
+from resources.lib.utils.profiling_utils import profiled
 
+# picture counts of scanned folders shared within the same process
+_scans: 'dict[str, tuple[float, list[tuple[str, int]]]]' = dict()
+_tables: 'dict[tuple[str, int], tuple[list[tuple[str, int]], list[tuple[str, int]], AliasTable]]' = dict()
 
-def get_good_matching_random_folder(path: str, wanted_amount: int) -> 'tuple[str,bool]':
 
-    def _scan_dirs_with_filecount(path: str, wanted_amount: int) -> 'list[str,int]':
+class AliasTable():
+
+    def __init__(self, weights: 'list[float]') -> None:
+
+        # Vose's alias method, picks an index in O(1) with probability weight / sum of weights
+        n = len(weights)
+        total = sum(weights)
+        self._prob: 'list[float]' = [1.0] * n
+        self._alias: 'list[int]' = list(range(n))
+
+        if not total:
+            self._prob = list()
+            return
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] += scaled[s] - 1
+            if scaled[l] < 1:
+                small.append(l)
+            else:
+                large.append(l)
+
+    def pick(self) -> int:
+
+        if not self._prob:
+            return None
 
-        def _scan(path: str) -> 'tuple[int, list[str,int]]':
+        i = randrange(len(self._prob))
+        return i if uniform(0, 1) < self._prob[i] else self._alias[i]
 
-            dirs, files = xbmcvfs.listdir(path)
-            files = [
-                f for f in files if vfs_utils.get_media_type(f) == PICTURE]
 
-            result = list()
-            files_count = len(files)
+@profiled("vfs.scan_picture_counts")
+def _scan_picture_counts(path: str) -> 'list[tuple[str, int]]':
 
-            for d in dirs:
-                sub_count, subs = _scan(os.path.join(path, d))
-                files_count += sub_count
-                if sub_count * 2 >= wanted_amount:
-                    result.extend(subs)
+    media_index = MediaIndex()
+    scanned = _scans.get(path)
+    if scanned and time.time() - scanned[0] < media_index.get_ttl():
+        return scanned[1]
 
-            result.append((path, files_count))
-            return files_count, result
+    # listings and types of unchanged folders are taken from the media index
+    counts: 'dict[str, int]' = dict()
+    result = list()
+    for folder, subfolders, files in vfs_utils.walk_folders(path, listdir=media_index.listdir):
+        types = vfs_utils.get_folder_types(folder, files, media_index)
+        files_count = list(types.values()).count(PICTURE)
+        for s in subfolders:
+            files_count += counts.pop(s)
+
+        counts[folder] = files_count
+        result.append((folder, files_count))
+
+    media_index.save()
+    _scans[path] = time.time(), result
+
+    # alias tables of former scan are outdated for any wanted amount
+    for key in [key for key in _tables if key[0] == path]:
+        del _tables[key]
+
+    return result
+
+
+def get_good_matching_random_folder(path: str, wanted_amount: int) -> 'tuple[str,bool]':
 
-        return _scan(path)[1]
+    dirs_with_filecount = _scan_picture_counts(path)
 
-    scale = 0
-    choices = list()
-    dirs_with_filecount = _scan_dirs_with_filecount(path, wanted_amount)
-    for dir_with_filecount in dirs_with_filecount:
-        if dir_with_filecount[1] > wanted_amount:
-            match_factor = wanted_amount / dir_with_filecount[1]
-        else:
-            match_factor = dir_with_filecount[1] / wanted_amount
+    table = _tables.get((path, wanted_amount))
+    if not table or table[0] is not dirs_with_filecount:
 
-        choices.append(
-            (match_factor, dir_with_filecount[0], dir_with_filecount[1], dir_with_filecount[1] > wanted_amount))
+        # subfolders are only considered if they have at least half of the wanted amount
+        choices = [(d, c) for d, c in dirs_with_filecount if d ==
+                   path or c * 2 >= wanted_amount]
+        weights = [wanted_amount / c if c > wanted_amount else c /
+                   wanted_amount for d, c in choices]
 
-        scale += match_factor
+        table = dirs_with_filecount, choices, AliasTable(weights)
+        _tables[(path, wanted_amount)] = table
 
-    pick = uniform(0, scale)
-    current = 0
-    for t in choices:
-        current += t[0]
-        if current > pick:
-            return t[1], t[3]
+    _, choices, alias_table = table
+    i = alias_table.pick()
+    if i is None:
+        return path, True
 
-    return path, True
+    return choices[i][0], choices[i][1] > wanted_amount
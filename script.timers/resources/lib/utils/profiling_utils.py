@@ -0,0 +1,162 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import xbmc
+import xbmcaddon
+import xbmcvfs
+
+_DUMP_INTERVAL = 300
+
+# upper bounds of histogram buckets in milliseconds
+_BUCKETS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+_enabled = False
+_lock = threading.Lock()
+_timings: 'dict[str, dict]' = dict()
+_counters: 'dict[str, int]' = dict()
+_since: datetime = None
+_last_dump = 0.0
+
+
+def set_enabled(enabled: bool) -> None:
+
+    global _enabled, _since, _last_dump
+    if enabled and not _enabled:
+        reset()
+        _since = datetime.now()
+        _last_dump = time.monotonic()
+
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+
+    return _enabled
+
+
+def reset() -> None:
+
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+
+def count(name: str, n=1) -> None:
+
+    if not _enabled:
+        return
+
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def record(name: str, secs: float) -> None:
+
+    ms = secs * 1000
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                      "histogram": [0] * (len(_BUCKETS) + 1)}
+            _timings[name] = timing
+
+        timing["count"] += 1
+        timing["total_ms"] += ms
+        timing["max_ms"] = max(timing["max_ms"], ms)
+
+        bucket = len(_BUCKETS)
+        for i, bound in enumerate(_BUCKETS):
+            if ms <= bound:
+                bucket = i
+                break
+
+        timing["histogram"][bucket] += 1
+
+
+@contextmanager
+def measure(name: str) -> None:
+
+    if not _enabled:
+        yield
+        return
+
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - t0)
+
+
+def profiled(name: str) -> 'callable':
+
+    def _decorator(func: 'callable') -> 'callable':
+
+        @functools.wraps(func)
+        def _wrapper(*args, **kwargs):
+
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            with measure(name):
+                return func(*args, **kwargs)
+
+        return _wrapper
+
+    return _decorator
+
+
+def get_stats() -> dict:
+
+    labels = ["<=%ims" % b for b in _BUCKETS] + [">%ims" % _BUCKETS[-1]]
+    with _lock:
+        timings = {name: {"count": t["count"],
+                          "total_ms": round(t["total_ms"], 3),
+                          "avg_ms": round(t["total_ms"] / t["count"], 3),
+                          "max_ms": round(t["max_ms"], 3),
+                          "histogram": {l: n for l, n in zip(labels, t["histogram"]) if n}}
+                   for name, t in _timings.items()}
+
+        return {
+            "since": _since.isoformat(timespec="seconds") if _since else None,
+            "dumped": datetime.now().isoformat(timespec="seconds"),
+            "timings": timings,
+            "counters": dict(_counters)
+        }
+
+
+def _get_dump_path() -> str:
+
+    addon = xbmcaddon.Addon()
+    profile_path = xbmcvfs.translatePath(addon.getAddonInfo('profile'))
+    return os.path.join(profile_path, "profiling.json")
+
+
+def dump() -> None:
+
+    global _last_dump
+    if not _enabled:
+        return
+
+    _last_dump = time.monotonic()
+    dump_path = _get_dump_path()
+    tmp = "%s.tmp" % dump_path
+    try:
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(obj=get_stats(), fp=file, indent=2, sort_keys=True)
+
+        os.replace(tmp, dump_path)
+
+    except OSError:
+        xbmc.log("[script.timers] Can't write profiling statistics.",
+                 xbmc.LOGWARNING)
+
+
+def dump_if_due() -> None:
+
+    if _enabled and time.monotonic() - _last_dump >= _DUMP_INTERVAL:
+        dump()
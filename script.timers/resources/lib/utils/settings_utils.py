@@ -185,8 +185,12 @@ def delete_timer() -> None:
     if idx is None:
         return
 
+    storage = Storage()
+    storage.begin()
     for i in idx:
-        Storage().delete_timer(timers[i].id)
+        storage.delete_timer(timers[i].id)
+
+    storage.commit()
 
     trigger_settings_changed_event()
 
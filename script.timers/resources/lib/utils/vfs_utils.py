@@ -1,12 +1,15 @@
 import os
 import re
+import threading
 
 import xbmc
 import xbmcaddon
 import xbmcgui
 import xbmcvfs
+from resources.lib.player.mediaindex import MediaIndex
 from resources.lib.player.mediatype import AUDIO, PICTURE, TYPES, VIDEO
 from resources.lib.player.playlist import PlayList
+from resources.lib.utils.profiling_utils import profiled
 
 _PVR_CHANNELS_MATCHER = "^pvr://channels/.*\.pvr$"
 _PVR_TV_CHANNELS_MATCHER = "^pvr://channels/tv/.*\.pvr$"
@@ -25,6 +28,16 @@ _PLAYLIST_TYPES = [".m3u", ".m3u8", ".pls"]
 
 _EXTERNAL_PATHS = ["http://", "https://"]
 
+_PLAYLIST_FIRST_ITEMS = 100
+_PLAYLIST_BATCH_SIZE = 500
+
+# incremented whenever a playlist is rebuilt, by playlist id
+_playlist_generations: 'dict[int, int]' = dict()
+
+# file extensions supported by Kodi, parsed once per Kodi version
+_supported_media: 'dict[str, frozenset[str]]' = None
+_supported_media_version: str = None
+
 
 def is_folder(path: str) -> bool:
 
@@ -126,22 +139,45 @@ def get_favourites_target(path: str) -> str:
     return re.sub(pattern, lambda match: bytes.fromhex(match.group()[1:]).decode("latin1"), m.groups()[1])
 
 
+def _refresh_supported_media() -> None:
+
+    global _supported_media, _supported_media_version
+
+    version = xbmc.getInfoLabel("System.BuildVersion")
+    if _supported_media is None or version != _supported_media_version:
+        _supported_media = {media: frozenset(xbmc.getSupportedMedia(media).lower().split("|")) - {""}
+                            for media in ["music", "video", "picture"]}
+        _supported_media_version = version
+
+
+def _get_supported_media() -> 'dict[str, frozenset[str]]':
+
+    if _supported_media is None:
+        _refresh_supported_media()
+
+    return _supported_media
+
+
 def get_media_type(path: str) -> str:
 
+    return _get_media_type_by_path(path) or _get_dominant_media_type(path, limit=100)
+
+
+def _get_media_type_by_path(path: str) -> str:
+
     ext = get_file_extension(path)
-    if is_musicdb(path) or is_audio_plugin(path) or is_pvr_radio_channel(path) or is_playlist(path) or ext and (ext + "|") in xbmc.getSupportedMedia("music"):
+    supported_media = _get_supported_media()
+    if is_musicdb(path) or is_audio_plugin(path) or is_pvr_radio_channel(path) or is_playlist(path) or ext in supported_media["music"]:
         return AUDIO
 
-    elif is_videodb(path) or is_video_plugin(path) or is_pvr(path) or ext and (ext + "|") in xbmc.getSupportedMedia("video"):
+    elif is_videodb(path) or is_video_plugin(path) or is_pvr(path) or ext in supported_media["video"]:
         return VIDEO
 
-    elif ext and (ext + "|") in xbmc.getSupportedMedia("picture"):
+    elif ext in supported_media["picture"]:
         return PICTURE
 
     else:
-        paths, type = get_files_and_type(
-            path, limit=100, no_leaves=True)
-        return type
+        return None
 
 
 def get_file_name(path: str) -> str:
@@ -186,132 +222,219 @@ def has_items_in_path(path: str) -> bool:
 
 def build_playlist(path: str, label: str) -> 'PlayList':
 
-    if has_items_in_path(path):
-        paths, type = get_files_and_type(path)
-        return convert_to_playlist(paths, type=type, label=label)
+    paths, type = get_files_and_type(path)
+    return convert_to_playlist(paths, type=type, label=label)
 
-    else:
-        type = get_media_type(path)
-        return convert_to_playlist([path], type=type, label=label)
 
+def _is_direct_url(path: str) -> bool:
+
+    return is_pvr(path) or is_audio_plugin(path) or is_video_plugin(path)
 
-def convert_to_playlist(paths: 'list[str]', type=VIDEO, label="") -> 'PlayList':
 
+def convert_to_playlist(paths: 'list[str]', type=VIDEO, label="", progressive=False) -> 'PlayList':
+
+    # progressive playlists start with their first items only, the rest is kept pending
+    # and added by fill_playlist() while playback has already started
     _type_id = TYPES.index(type or VIDEO)
+    _playlist_generations[_type_id] = _playlist_generations.get(
+        _type_id, 0) + 1
     playlist = PlayList(_type_id)
     playlist.clear()
 
-    for path in paths:
+    first = _PLAYLIST_FIRST_ITEMS if progressive else len(paths)
+    for path in paths[:first]:
         label = label if label and len(paths) == 1 else get_file_name(path)
         li = xbmcgui.ListItem(label=label, path=path)
         playlist.add(url=path, listitem=li)
-        if is_pvr(path) or is_audio_plugin(path) or is_video_plugin(path):
+        if _is_direct_url(path):
             playlist.clear()
             playlist.directUrl = path
-            break
+            return playlist
 
+    playlist.pending = paths[first:]
     return playlist
 
 
-def scan_item_paths(path: str, limit=None) -> 'list[str]':
+def fill_playlist(playlist: 'PlayList') -> None:
+
+    # adds pending items in batches, stops as soon as the playlist has been rebuilt
+    _type_id = playlist.getPlayListId()
+    generation = _playlist_generations.get(_type_id)
+    paths, playlist.pending = playlist.pending, list()
+    for i in range(0, len(paths), _PLAYLIST_BATCH_SIZE):
+        if _playlist_generations.get(_type_id) != generation:
+            return
+
+        for path in paths[i:i + _PLAYLIST_BATCH_SIZE]:
+            if not _is_direct_url(path):
+                li = xbmcgui.ListItem(label=get_file_name(path), path=path)
+                playlist.add(url=path, listitem=li)
+
+
+def _get_scan_threads() -> int:
+
+    return xbmcaddon.Addon().getSettingInt("vfs_scan_threads") or 1
+
+
+def walk_folders(path: str, listdir=xbmcvfs.listdir) -> 'Iterator[tuple[str, list[str], list[str]]]':
+
+    # yields (folder, subfolders, files) depth-first with subfolders before their parent,
+    # listings of subfolders are fetched ahead by a bounded pool of threads
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    def _subfolders(path: str, dirs: 'list[str]') -> 'list[str]':
+
+        return ["%s%s/" % (path, d) for d in dirs if d != ""]
+
+    threads = _get_scan_threads()
+    executor: ThreadPoolExecutor = None
+    cancelled = threading.Event()
+
+    def _list(path: str) -> 'tuple[list[str], list[str], list[tuple[str, Future]]]':
+
+        if cancelled.is_set():
+            return list(), list(), list()
+
+        dirs, files = listdir(path)
+        subfolders = _subfolders(path, dirs)
+        if threads > 1 and subfolders:
+            return subfolders, files, [(s, executor.submit(_list, s)) for s in subfolders]
+
+        else:
+            return subfolders, files, None
+
+    def _walk(path: str, listing: 'tuple[list[str], list[str], list[tuple[str, Future]]]') -> 'Iterator[tuple[str, list[str], list[str]]]':
 
-    def _scan(path: str) -> 'list[str]':
+        subfolders, files, futures = listing
+        if futures is None:
+            for s in subfolders:
+                yield from _walk(s, _list(s))
+
+        else:
+            for s, future in futures:
+                yield from _walk(s, future.result())
+
+        yield path, subfolders, files
+
+    # root is listed by the calling thread since most calls are made for single files
+    dirs, files = listdir(path)
+    subfolders = _subfolders(path, dirs)
+    if threads > 1 and subfolders:
+        executor = ThreadPoolExecutor(max_workers=threads)
+        listing = subfolders, files, [(s, executor.submit(_list, s))
+                                      for s in subfolders]
+    else:
+        listing = subfolders, files, None
+
+    try:
+        yield from _walk(path, listing)
+
+    finally:
+        if executor:
+            cancelled.set()
+            executor.shutdown(wait=False)
 
-        _result = list()
 
-        dirs, files = xbmcvfs.listdir(path)
-        for d in dirs:
-            if d != "":
-                _result.extend(_scan("%s%s/" % (path, d)))
+def get_folder_types(folder: str, files: 'list[str]', media_index: MediaIndex) -> 'dict[str, str]':
 
+    # files of a listing are no folders, so unknown files are not walked into
+    types = media_index.get_types(folder)
+    if types is None:
+        types = {f: _get_media_type_by_path(build_path_to_ressource(folder, f))
+                 for f in files}
+        media_index.set_types(folder, types)
+
+    return types
+
+
+def _walk_media_files(path: str, media_index: MediaIndex) -> 'Iterator[tuple[str, str]]':
+
+    for folder, subfolders, files in walk_folders(path, listdir=media_index.listdir):
+        types = media_index.get_types(folder)
+        _types = dict()
         for f in files:
-            if not is_supported_media(f):
-                continue
+            _path = build_path_to_ressource(folder, f)
+            media_type = types[f] if types else _get_media_type_by_path(
+                _path)
+            _types[f] = media_type
+            yield _path, media_type
+
+        # only reached if all files of this folder have been classified
+        if types is None:
+            media_index.set_types(folder, _types)
 
-            if (not limit or len(_result) < limit):
-                _result.append(build_path_to_ressource(path, f))
 
-        return _result
+def iter_media_files(path: str) -> 'Iterator[tuple[str, str]]':
 
     if not path or is_pvr(path) or is_audio_plugin(path) or is_video_plugin(path):
-        files = list()
+        return
 
     elif is_playlist(path):
-        files = [path]
+        yield path, AUDIO
 
     else:
-        files = _scan(path)
-        files.sort()
+        _refresh_supported_media()
+        media_index = MediaIndex()
+        try:
+            yield from _walk_media_files(path, media_index)
 
-    return files
+        finally:
+            media_index.save()
 
 
-def get_items_group_by_mediatype(path: str, limit=None) -> 'tuple[list[str], list[str], list[str], list[str]]':
+@profiled("vfs.scan_item_paths")
+def scan_item_paths(path: str, limit=None) -> 'list[str]':
 
-    def _scan(path: str) -> 'tuple[list[str],list[str],list[str]]':
+    files = list()
+    for _path, media_type in iter_media_files(path):
+        if limit and len(files) >= limit:
+            break
 
-        _audio_files = list()
-        _video_files = list()
-        _pictures = list()
+        elif media_type:
+            files.append(_path)
 
-        dirs, files = xbmcvfs.listdir(path)
-        for d in dirs:
-            if d != "":
-                _a, _v, _p = _scan("%s%s/" % (path, d))
-                _audio_files.extend(_a)
-                _video_files.extend(_v)
-                _pictures.extend(_p)
+    files.sort()
+    return files
 
-        for f in files:
-            _path = build_path_to_ressource(path, f)
 
-            if (limit and (len(_audio_files) + len(_video_files) + len(_pictures)) >= limit):
-                return _audio_files, _video_files, _pictures
+@profiled("vfs.get_items_group_by_mediatype")
+def get_items_group_by_mediatype(path: str, limit=None) -> 'tuple[list[str], list[str], list[str]]':
 
-            media_type = get_media_type(_path)
-            if media_type == AUDIO:
-                _audio_files.append(_path)
+    groups = _group_by_mediatype(path, limit=limit)
+    for group in groups:
+        group.sort()
 
-            elif media_type == VIDEO:
-                _video_files.append(_path)
+    return tuple(groups)
 
-            elif media_type == PICTURE:
-                _pictures.append(_path)
 
-        return _audio_files, _video_files, _pictures
+def _group_by_mediatype(path: str, limit=None, stop_if_dominant=False) -> 'list[list[str]]':
 
-    if not path:
-        audio_files = list()
-        video_files = list()
-        pictures = list()
+    groups = [list(), list(), list()]
+    total = 0
+    for _path, media_type in iter_media_files(path):
+        if limit and total >= limit:
+            break
 
-    elif is_playlist(path):
-        audio_files = [path]
-        video_files = list()
-        pictures = list()
+        elif media_type not in TYPES:
+            continue
 
-    else:
-        audio_files, video_files, pictures = _scan(path)
-        audio_files.sort()
-        video_files.sort()
-        pictures.sort()
+        groups[TYPES.index(media_type)].append(_path)
+        total += 1
 
-    return audio_files, video_files, pictures
+        if stop_if_dominant and limit:
+            sizes = sorted([len(group) for group in groups], reverse=True)
+            if sizes[0] > sizes[1] + limit - total:
+                break
 
+    return groups
 
-def get_files_and_type(path: str, limit=None, no_leaves=False) -> 'tuple[list[str],str]':
 
-    if has_items_in_path(path):
-        a, v, p = get_items_group_by_mediatype(path, limit=limit)
-    elif not no_leaves:
-        return [path], get_media_type(path)
-    else:
-        return [path], None
+def _get_dominant_group(groups: 'list[list[str]]') -> 'tuple[list[str],str]':
 
     size = 0
     files = None
     type = -1
-    for i, l in enumerate([a, v, p]):
+    for i, l in enumerate(groups):
         if len(l) > size:
             size = len(l)
             files = l
@@ -320,6 +443,30 @@ def get_files_and_type(path: str, limit=None, no_leaves=False) -> 'tuple[list[st
     return files, TYPES[type] if type >= 0 else None
 
 
+def _get_dominant_media_type(path: str, limit=None) -> str:
+
+    groups = _group_by_mediatype(path, limit=limit, stop_if_dominant=True)
+    files, type = _get_dominant_group(groups)
+    return type
+
+
+@profiled("vfs.get_files_and_type")
+def get_files_and_type(path: str, limit=None, no_leaves=False) -> 'tuple[list[str],str]':
+
+    groups = _group_by_mediatype(path, limit=limit)
+    if any(groups):
+        for group in groups:
+            group.sort()
+
+        return _get_dominant_group(groups)
+
+    elif not no_leaves:
+        return [path], get_media_type(path)
+
+    else:
+        return [path], None
+
+
 def get_longest_common_path(files: 'list[str]') -> str:
 
     if not files:
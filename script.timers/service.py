@@ -1,4 +1,5 @@
 from resources.lib.timer.scheduler import Scheduler
+from resources.lib.utils import profiling_utils
 from resources.lib.utils.system_utils import set_windows_unlock
 
 
@@ -9,5 +10,7 @@ def run() -> None:
         scheduler.start()
 
     finally:
+        scheduler.action.stopFader()
+        profiling_utils.dump()
         scheduler.reset_powermanagement_displaysoff()
         set_windows_unlock(False)
@@ -0,0 +1,59 @@
+import unittest
+from datetime import datetime, timedelta
+
+from resources.lib.timer.concurrency import PeriodIndex
+from resources.lib.timer.period import Period
+from resources.lib.timer.timer import Timer
+
+
+class TestConcurrency(unittest.TestCase):
+
+    def _timer(self, id: int, periods: 'list[Period]') -> Timer:
+
+        timer = Timer(id)
+        timer.periods = periods
+        return timer
+
+    def test_period_index_weekdays(self):
+
+        timer1 = self._timer(1, [Period(timedelta(days=0, hours=8), timedelta(days=0, hours=10)),
+                                 Period(timedelta(days=2, hours=8), timedelta(days=2, hours=10))])
+        timer2 = self._timer(2, [Period(timedelta(days=2, hours=9), timedelta(days=2, hours=11))])
+        timer3 = self._timer(3, [Period(timedelta(days=4, hours=9), timedelta(days=4, hours=11))])
+
+        index = PeriodIndex([timer1, timer2, timer3])
+
+        found = index.find(
+            Period(timedelta(days=2, hours=9, minutes=30), timedelta(days=2, hours=9, minutes=45)))
+        self.assertEqual(sorted([i for i, p in found]), [0, 1])
+
+        found = index.find(
+            Period(timedelta(days=1, hours=9), timedelta(days=1, hours=10)))
+        self.assertEqual(len(found), 0)
+
+    def test_period_index_over_end_of_week(self):
+
+        timer1 = self._timer(1, [Period(timedelta(days=6, hours=23), timedelta(days=7, hours=1))])
+        timer2 = self._timer(2, [Period(timedelta(days=3, hours=23), timedelta(days=4, hours=1))])
+
+        index = PeriodIndex([timer1, timer2])
+
+        found = index.find(
+            Period(timedelta(days=0, minutes=30), timedelta(days=0, minutes=45)))
+        self.assertEqual([i for i, p in found], [0])
+
+    def test_period_index_by_date(self):
+
+        # Wednesday
+        timer1 = self._timer(1, [Period(datetime(2024, 8, 21, 8, 0), datetime(2024, 8, 21, 10, 0))])
+        timer2 = self._timer(2, [Period(timedelta(days=2, hours=9), timedelta(days=2, hours=11))])
+
+        index = PeriodIndex([timer1, timer2])
+
+        found = index.find(
+            Period(datetime(2024, 8, 28, 7, 0), datetime(2024, 8, 28, 8, 30)))
+        self.assertEqual([i for i, p in found], [0])
+
+        found = index.find(
+            Period(timedelta(days=2, hours=8, minutes=30), timedelta(days=2, hours=9, minutes=30)))
+        self.assertEqual(sorted([i for i, p in found]), [0, 1])
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from resources.lib.player import durationcache, player_utils
+from resources.lib.player.durationcache import DurationCache
+from resources.lib.player.mediatype import TYPES, VIDEO
+
+_RESULTS = {
+    "Playlist.GetItems": {"items": [{"file": "smb://nas/a.mkv", "duration": 600},
+                                    {"file": "smb://nas/b.mkv", "runtime": 0},
+                                    {"file": "smb://nas/c.mkv"}]},
+    "Files.GetFileDetails": {"filedetails": {"file": "smb://nas/b.mkv", "runtime": 300}}
+}
+
+
+def _execute(request: str) -> str:
+
+    def _respond(r: dict) -> dict:
+        return {"id": r["id"], "jsonrpc": "2.0", "result": _RESULTS[r["method"]]}
+
+    request = json.loads(request)
+    if type(request) == list:
+        return json.dumps([_respond(r) for r in request])
+
+    return json.dumps(_respond(request))
+
+
+class TestDurationCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+
+        self._dir = tempfile.TemporaryDirectory()
+        DurationCache._entries = None
+        DurationCache._dirty = False
+        self._patch = mock.patch.object(DurationCache, "_get_cache_path", return_value=os.path.join(
+            self._dir.name, "durations.json"))
+        self._patch.start()
+
+    def tearDown(self) -> None:
+
+        self._patch.stop()
+        self._dir.cleanup()
+        DurationCache._entries = None
+        DurationCache._dirty = False
+
+    def test_persistence(self):
+
+        cache = DurationCache()
+        cache.set("smb://nas/a.mkv", 600.0)
+        cache.set("smb://nas/b.mkv", 0)
+        cache.save()
+
+        DurationCache._entries = None
+        self.assertEqual(DurationCache().get("smb://nas/a.mkv"), 600.0)
+        self.assertEqual(DurationCache().get("smb://nas/b.mkv"), 0.0)
+
+    def test_eviction(self):
+
+        cache = DurationCache()
+        with mock.patch.object(durationcache, "_MAX_ENTRIES", 2):
+            cache.set("a", 1.0)
+            cache.set("b", 2.0)
+            cache.set("a", 3.0)
+            cache.set("c", 4.0)
+
+        self.assertEqual(cache.get("a"), 3.0)
+        self.assertEqual(cache.get("b"), 0.0)
+        self.assertEqual(cache.get("c"), 4.0)
+
+    @mock.patch("xbmc.executeJSONRPC", side_effect=_execute)
+    def test_playlist_durations(self, executeJSONRPC: mock.MagicMock):
+
+        DurationCache().set("smb://nas/c.mkv", 900.0)
+        self.assertEqual(player_utils.get_playlist_durations(
+            TYPES.index(VIDEO)), [600.0, 300.0, 900.0])
+        self.assertEqual(DurationCache().get("smb://nas/b.mkv"), 300.0)
+        self.assertEqual(executeJSONRPC.call_count, 2)
+
+        # durations from file details have been cached
+        self.assertEqual(player_utils.get_playlist_durations(
+            TYPES.index(VIDEO)), [600.0, 300.0, 900.0])
+        self.assertEqual(executeJSONRPC.call_count, 3)
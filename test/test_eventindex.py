@@ -0,0 +1,85 @@
+import unittest
+from datetime import datetime, timedelta
+
+from resources.lib.timer.eventindex import EventIndex
+from resources.lib.timer.period import Period
+from resources.lib.timer.timer import (STATE_ENDING, STATE_RUNNING,
+                                       STATE_STARTING, STATE_WAITING, Timer)
+from resources.lib.utils.datetime_utils import DateTimeDelta
+
+
+class TestEventIndex(unittest.TestCase):
+
+    def _build_timers(self) -> 'list[Timer]':
+
+        timers = list()
+        for i in range(20):
+            timer = Timer(i)
+            timer.periods = [Period(timedelta(days=d, minutes=i * 30),
+                                    timedelta(days=d, minutes=i * 30 + 45)) for d in range(0, 7, 1 + i % 3)]
+            timers.append(timer)
+
+        return timers
+
+    def _adjust_state(self, timers: 'list[Timer]') -> None:
+
+        for t in timers:
+            if t.state == STATE_STARTING:
+                t.state = STATE_RUNNING
+
+            elif t.state == STATE_ENDING:
+                t.state = STATE_WAITING
+
+    def test_same_states_as_full_scan(self):
+
+        expected = self._build_timers()
+        indexed = self._build_timers()
+        index = EventIndex()
+
+        dt = datetime(2024, 8, 19, 0, 0)
+        for step in range(0, 7 * 24 * 60, 5):
+            now = DateTimeDelta(dt + timedelta(minutes=step))
+
+            for t in expected:
+                t.apply(now)
+
+            index.apply(indexed, now)
+
+            self.assertEqual([t.state for t in indexed],
+                             [t.state for t in expected])
+
+            upcoming = min([t.upcoming_event for t in expected])
+            self.assertEqual(index.upcoming()[0], upcoming)
+
+            self._adjust_state(expected)
+            self._adjust_state(indexed)
+
+    def test_apply_only_due_timers(self):
+
+        timers = self._build_timers()
+        index = EventIndex()
+
+        now = DateTimeDelta(datetime(2024, 8, 19, 0, 0))
+        self.assertEqual(len(index.apply(timers, now)), len(timers))
+        self._adjust_state(timers)
+
+        # timer 0 is running, nothing else is due
+        now = DateTimeDelta(datetime(2024, 8, 19, 0, 10))
+        self.assertEqual([t.id for t in index.apply(timers, now)], [0])
+
+        # timer 1 starts
+        now = DateTimeDelta(datetime(2024, 8, 19, 0, 30))
+        self.assertEqual([t.id for t in index.apply(timers, now)], [0, 1])
+        self.assertEqual(timers[1].state, STATE_STARTING)
+
+    def test_rebuild_if_timers_have_changed(self):
+
+        timers = self._build_timers()
+        index = EventIndex()
+
+        now = DateTimeDelta(datetime(2024, 8, 19, 0, 0))
+        index.apply(timers, now)
+
+        other_timers = self._build_timers()
+        self.assertEqual(len(index.apply(other_timers, now)),
+                         len(other_timers))
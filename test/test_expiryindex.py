@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from resources.lib.timer.expiryindex import ExpiryIndex, get_expiry
+from resources.lib.timer.storage import Storage
+from resources.lib.timer.timer import (END_TYPE_TIME, TIMER_BY_DATE,
+                                       TIMER_WEEKLY, Timer)
+
+
+def _build_timer(id: int, days: 'list[int]', date: str) -> Timer:
+
+    timer = Timer(id)
+    timer.label = "Timer %i" % id
+    timer.days = days
+    timer.date = date
+    timer.start = "08:00"
+    timer.end_type = END_TYPE_TIME
+    timer.end = "10:00"
+    timer.init()
+    return timer
+
+
+class TestExpiryIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+
+        self._dir = tempfile.TemporaryDirectory()
+        storage_path = os.path.join(self._dir.name, "timers.json")
+        open(storage_path, "w").close()
+        self._patch = mock.patch.object(
+            Storage, "_storage_path", storage_path)
+        self._patch.start()
+        Storage()._invalidate_cache()
+
+    def tearDown(self) -> None:
+
+        self._patch.stop()
+        Storage()._invalidate_cache()
+        self._dir.cleanup()
+
+    def test_get_expiry(self):
+
+        self.assertIsNone(get_expiry(_build_timer(
+            1, [0, 1, TIMER_WEEKLY], "")))
+        self.assertEqual(get_expiry(_build_timer(
+            2, [TIMER_BY_DATE], "2024-08-15")), datetime(2024, 8, 15, 10))
+        self.assertEqual(get_expiry(_build_timer(3, [4, 6], "2024-08-15")),
+                         datetime(2024, 8, 16, 10))
+        self.assertEqual(get_expiry(_build_timer(
+            4, [4, 6], "")), datetime.min)
+
+    def test_incremental_update(self):
+
+        now = datetime(2024, 8, 17, 15)
+        storage = Storage()
+        storage.begin()
+        storage.save_timer(_build_timer(1, [0, 1, TIMER_WEEKLY], ""))
+        storage.save_timer(_build_timer(2, [TIMER_BY_DATE], "2024-08-15"))
+        storage.save_timer(_build_timer(3, [TIMER_BY_DATE], "2024-08-20"))
+        storage.commit()
+
+        index = ExpiryIndex(storage)
+        index.load()
+        self.assertEqual(index.pop_expired(now), [2])
+        index.save()
+
+        storage.save_timer(_build_timer(4, [TIMER_BY_DATE], "2024-08-16"))
+        storage.delete_timer(3)
+
+        # only journal entries since last run are indexed
+        index = ExpiryIndex(storage)
+        with mock.patch.object(storage, "load_timers_from_storage") as load_timers_from_storage:
+            index.load()
+            load_timers_from_storage.assert_not_called()
+
+        self.assertEqual(index.pop_expired(now), [4])
+        self.assertEqual(index.pop_expired(datetime(2099, 1, 1)), [])
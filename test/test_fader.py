@@ -0,0 +1,119 @@
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from resources.lib.test.mockplayer import MockPlayer
+from resources.lib.test.mockstorage import MockStorage
+from resources.lib.timer.fader import (FADE_CURVE_LINEAR,
+                                       FADE_CURVE_LOGARITHMIC,
+                                       FADE_CURVE_PERCEPTUAL, Fader, Ramp)
+from resources.lib.timer.scheduleraction import SchedulerAction
+
+_START = datetime(2022, 12, 24, 20, 0)
+
+
+class TestFader(unittest.TestCase):
+
+    def _ramp(self, vol_from: int, vol_to: int, curve=FADE_CURVE_LINEAR, seconds=100) -> Ramp:
+
+        return Ramp(start=_START, end=_START + timedelta(seconds=seconds), vol_from=vol_from, vol_to=vol_to, curve=curve)
+
+    def test_linear(self):
+
+        ramp = self._ramp(50, 100)
+        self.assertEqual(ramp.get_volume(_START - timedelta(seconds=1)), 50)
+        self.assertEqual(ramp.get_volume(_START), 50)
+        self.assertEqual(ramp.get_volume(_START + timedelta(seconds=50)), 75)
+        self.assertEqual(ramp.get_volume(_START + timedelta(seconds=100)), 100)
+        self.assertEqual(ramp.get_volume(_START + timedelta(seconds=101)), 100)
+
+        ramp = self._ramp(100, 50)
+        self.assertEqual(ramp.get_volume(_START + timedelta(seconds=50)), 75)
+
+    def test_curves(self):
+
+        middle = _START + timedelta(seconds=50)
+        self.assertEqual(self._ramp(0, 100, FADE_CURVE_LOGARITHMIC).get_volume(middle), 74)
+        self.assertEqual(self._ramp(0, 100, FADE_CURVE_PERCEPTUAL).get_volume(middle), 25)
+        self.assertEqual(self._ramp(100, 0, FADE_CURVE_PERCEPTUAL).get_volume(middle), 75)
+
+        for curve in [FADE_CURVE_LINEAR, FADE_CURVE_LOGARITHMIC, FADE_CURVE_PERCEPTUAL]:
+            ramp = self._ramp(0, 100, curve)
+            self.assertEqual(ramp.get_volume(ramp.end), 100)
+
+    def test_next_change(self):
+
+        for curve in [FADE_CURVE_LINEAR, FADE_CURVE_LOGARITHMIC, FADE_CURVE_PERCEPTUAL]:
+            for vol_from, vol_to in [(10, 30), (30, 10)]:
+                ramp = self._ramp(vol_from, vol_to, curve)
+                now = ramp.start
+                volumes = [ramp.get_volume(now)]
+                while True:
+                    now = ramp.get_next_change(now)
+                    if not now:
+                        break
+
+                    # step a little beyond the boundary of rounding
+                    now += timedelta(milliseconds=1)
+                    volumes.append(ramp.get_volume(now))
+
+                self.assertEqual(volumes[-1], vol_to)
+                self.assertTrue(len(volumes) <= 22)
+
+        self.assertIsNone(self._ramp(50, 50).get_next_change(_START))
+
+    def test_coalesced_writes(self):
+
+        writes = list()
+        fader = Fader(writes.append)
+
+        ramp = self._ramp(0, 10)
+        for s in range(0, 101):
+            fader.fade(ramp, _START + timedelta(seconds=s))
+
+        self.assertEqual(writes, list(range(0, 11)))
+
+        fader.fade(ramp, ramp.end)
+        self.assertEqual(len(writes), 11)
+
+        fader.stop()
+        fader.fade(ramp, ramp.end)
+        self.assertEqual(len(writes), 12)
+
+    def test_threaded(self):
+
+        writes = list()
+        fader = Fader(writes.append)
+        fader.set_threaded(True)
+
+        ramp = self._ramp(0, 5, seconds=0.5)
+        fader.fade(ramp, _START)
+        self.assertTrue(fader.is_threaded())
+
+        until = time.monotonic() + 5
+        while fader.is_running() and time.monotonic() < until:
+            time.sleep(0.05)
+
+        self.assertEqual(writes, [0, 1, 2, 3, 4, 5])
+
+        fader.fade(self._ramp(5, 0, seconds=60), _START)
+        self.assertTrue(fader.is_running())
+        fader.stop()
+        self.assertFalse(fader.is_running())
+
+    def test_invalidated_by_player(self):
+
+        player = MockPlayer()
+        fader = SchedulerAction(player, MockStorage())._fader
+
+        ramp = self._ramp(0, 10)
+        fader.fade(ramp, _START + timedelta(seconds=50))
+        self.assertEqual(player.getVolume(), 5)
+
+        # player mutes while seeking and restores its recent volume afterwards
+        player._recent_volume = 3
+        player._resetSeek()
+        self.assertEqual(player.getVolume(), 3)
+
+        fader.fade(ramp, _START + timedelta(seconds=50))
+        self.assertEqual(player.getVolume(), 5)
@@ -1,6 +1,7 @@
 import unittest
 
 from datetime import datetime
+from unittest import mock
 
 from resources.lib.test.mockplayer import VIDEO
 from resources.lib.test.mockstorage import MockStorage
@@ -528,3 +529,98 @@ class TestHousekeeper(unittest.TestCase):
 
         self.assertEquals(action, housekeeper.ACTION_NOTHING)
         self.assertEquals(timers[0].date, "2024-08-18")
+
+    def test_cleanup_in_one_write(self):
+        data = [
+            {
+                "date": "2024-08-%i" % (10 + i) if i < 3 else "",
+                "days": [8] if i < 3 else [0, 1],
+                "duration": "02:00",
+                "duration_offset": 0,
+                "end": "10:00",
+                "end_offset": 0,
+                "end_type": END_TYPE_TIME,
+                "fade": FADE_OFF,
+                "id": i,
+                "label": "Timer %i" % i,
+                "media_action": MEDIA_ACTION_START_STOP,
+                "media_type": VIDEO,
+                "notify": True,
+                "path": "/music/song.mp3",
+                "priority": 0,
+                "repeat": False,
+                "resume": True,
+                "shuffle": False,
+                "start": "08:00",
+                "start_offset": 0,
+                "system_action": 0,
+                "vol_max": 100,
+                "vol_min": 75
+            } for i in range(4)
+        ]
+
+        storage = MockStorage(data=data)
+        with mock.patch("xbmcaddon.Addon.getSettingBool", return_value=True), \
+                mock.patch.object(housekeeper, "Storage", return_value=storage), \
+                mock.patch.object(storage, "_append_to_journal", wraps=storage._append_to_journal) as append:
+            housekeeper.cleanup_outdated_timers()
+
+        append.assert_called_once()
+        self.assertEquals([timer.id for timer in storage.load_timers_from_storage()], [3])
+
+        # a failing batch is rolled back as a whole
+        storage = MockStorage(data=data)
+        with mock.patch("xbmcaddon.Addon.getSettingBool", return_value=True), \
+                mock.patch.object(housekeeper, "Storage", return_value=storage), \
+                mock.patch.object(housekeeper, "check_timer", side_effect=[housekeeper.ACTION_DELETE, ValueError]), \
+                mock.patch.object(storage, "_append_to_journal") as append:
+            self.assertRaises(
+                ValueError, housekeeper.cleanup_outdated_timers)
+
+        append.assert_not_called()
+        self.assertIsNone(storage._batch)
+
+    def test_cleanup_persists_moved_date(self):
+        data = [
+            {
+                "date": "2024-08-14",
+                "days": [8],
+                "duration": "02:00",
+                "duration_offset": 0,
+                "end": "10:00",
+                "end_offset": 0,
+                "end_type": END_TYPE_TIME,
+                "fade": FADE_OFF,
+                "id": 1,
+                "label": "Timer 1",
+                "media_action": MEDIA_ACTION_START_STOP,
+                "media_type": VIDEO,
+                "notify": True,
+                "path": "/music/song.mp3",
+                "priority": 0,
+                "repeat": False,
+                "resume": True,
+                "shuffle": False,
+                "start": "08:00",
+                "start_offset": 0,
+                "system_action": 0,
+                "vol_max": 100,
+                "vol_min": 75
+            }
+        ]
+
+        def _move_date(timer, threshold) -> int:
+            timer.date = "2099-08-14"
+            return housekeeper.ACTION_NOTHING
+
+        storage = MockStorage(data=data)
+        with mock.patch("xbmcaddon.Addon.getSettingBool", return_value=True), \
+                mock.patch.object(housekeeper, "Storage", return_value=storage), \
+                mock.patch.object(housekeeper, "check_timer", side_effect=_move_date):
+            housekeeper.cleanup_outdated_timers()
+
+        # a timer that is kept may have got another date, index must refer to the stored one
+        self.assertEquals(
+            storage.load_timers_from_storage()[0].date, "2099-08-14")
+        self.assertEquals(storage.load_expiry_index()["entries"],
+                          [("2099-08-14T10:00:00", 1)])
@@ -0,0 +1,45 @@
+import json
+import unittest
+from unittest import mock
+
+from resources.lib.utils import jsonrpc_utils
+
+
+def _execute(request: str) -> str:
+
+    def _respond(r: dict) -> dict:
+        return {"id": r["id"], "jsonrpc": "2.0", "result": {"method": r["method"]}}
+
+    request = json.loads(request)
+    if type(request) == list:
+        # answer in reversed order to check that results are matched by id
+        return json.dumps([_respond(r) for r in reversed(request)])
+
+    return json.dumps(_respond(request))
+
+
+class TestJsonRpcUtils(unittest.TestCase):
+
+    def test_unique_ids(self):
+
+        ids = [jsonrpc_utils._build_request("JSONRPC.Ping")["id"]
+               for _ in range(1000)]
+        self.assertEqual(len(set(ids)), len(ids))
+
+    @mock.patch("xbmc.executeJSONRPC", side_effect=_execute)
+    def test_batch(self, executeJSONRPC: mock.MagicMock):
+
+        results = jsonrpc_utils.json_rpc_batch([("Player.GetActivePlayers", None),
+                                                ("PVR.GetClients", None),
+                                                ("Player.GetProperties", {"playerid": 1})])
+
+        self.assertEqual(executeJSONRPC.call_count, 1)
+        self.assertEqual([r["method"] for r in results], [
+                         "Player.GetActivePlayers", "PVR.GetClients", "Player.GetProperties"])
+
+    @mock.patch("xbmc.executeJSONRPC", return_value=json.dumps({"id": None, "jsonrpc": "2.0", "error": {"code": -32600}}))
+    def test_batch_error(self, executeJSONRPC: mock.MagicMock):
+
+        self.assertEqual(jsonrpc_utils.json_rpc_batch(
+            [("A.B", None), ("C.D", None)]), [None, None])
+        self.assertEqual(jsonrpc_utils.json_rpc_batch([]), [])
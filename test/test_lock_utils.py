@@ -0,0 +1,64 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from resources.lib.utils import lock_utils
+
+
+class TestLockUtils(unittest.TestCase):
+
+    def setUp(self) -> None:
+
+        self._dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._dir.name, "timers.json.lck")
+
+    def tearDown(self) -> None:
+
+        self._dir.cleanup()
+
+    def test_shared_lock_per_path(self):
+
+        self.assertIs(lock_utils.get_lock(self._path),
+                      lock_utils.get_lock(self._path))
+
+    def test_reentrant(self):
+
+        lock = lock_utils.FileLock(self._path)
+        with lock:
+            with lock:
+                self.assertTrue(os.path.exists(self._path))
+
+        self.assertTrue(lock.acquire(blocking=False))
+        lock.release()
+
+    def test_exclusive_between_instances(self):
+
+        first = lock_utils.FileLock(self._path)
+        second = lock_utils.FileLock(self._path)
+
+        with first:
+            self.assertFalse(second.acquire(blocking=False))
+
+        self.assertTrue(second.acquire(blocking=False))
+        second.release()
+
+    def test_exclusive_between_threads(self):
+
+        lock = lock_utils.get_lock(self._path)
+        counter = [0]
+
+        def increment():
+            for _ in range(200):
+                with lock:
+                    value = counter[0]
+                    counter[0] = value + 1
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for t in threads:
+            t.start()
+
+        for t in threads:
+            t.join()
+
+        self.assertEqual(counter[0], 800)
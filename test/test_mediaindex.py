@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from resources.lib.player.mediaindex import MediaIndex
+from resources.lib.player.mediatype import AUDIO, PICTURE
+
+_LISTINGS = {
+    "smb://nas/music/": (["a"], ["cover.jpg"]),
+    "smb://nas/music/a/": ([], ["1.mp3", "2.mp3"])
+}
+
+
+def _listdir(path: str) -> 'tuple[list[str], list[str]]':
+
+    dirs, files = _LISTINGS.get(path, ([], []))
+    return list(dirs), list(files)
+
+
+class TestMediaIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+
+        self._dir = tempfile.TemporaryDirectory()
+        MediaIndex._entries = None
+        MediaIndex._dirty = False
+
+    def tearDown(self) -> None:
+
+        self._dir.cleanup()
+        MediaIndex._entries = None
+        MediaIndex._dirty = False
+
+    def _build_index(self, ttl: int) -> MediaIndex:
+
+        with mock.patch("xbmcaddon.Addon.getSettingInt", return_value=ttl):
+            index = MediaIndex()
+
+        index._get_index_path = lambda: os.path.join(
+            self._dir.name, "mediaindex.json")
+        return index
+
+    @mock.patch("xbmcvfs.listdir", side_effect=_listdir)
+    def test_listdir_from_index(self, listdir: mock.MagicMock):
+
+        index = self._build_index(ttl=60)
+        self.assertEqual(index.listdir("smb://nas/music/"),
+                         (["a"], ["cover.jpg"]))
+        self.assertEqual(index.listdir("smb://nas/music/"),
+                         (["a"], ["cover.jpg"]))
+        self.assertEqual(listdir.call_count, 1)
+
+        # empty listings, e.g. of files, are not indexed
+        index.listdir("smb://nas/music/a/1.mp3")
+        index.listdir("smb://nas/music/a/1.mp3")
+        self.assertEqual(listdir.call_count, 3)
+
+    @mock.patch("xbmcvfs.listdir", side_effect=_listdir)
+    def test_persisted(self, listdir: mock.MagicMock):
+
+        index = self._build_index(ttl=60)
+        index.listdir("smb://nas/music/")
+        index.set_types("smb://nas/music/", {"cover.jpg": PICTURE})
+        index.listdir("smb://nas/music/a/")
+        index.set_types("smb://nas/music/a/",
+                        {"1.mp3": AUDIO, "2.mp3": AUDIO})
+        index.save()
+
+        MediaIndex._entries = None
+        index = self._build_index(ttl=60)
+        self.assertEqual(index.listdir("smb://nas/music/a/"),
+                         ([], ["1.mp3", "2.mp3"]))
+        self.assertEqual(index.get_counts("smb://nas/music/a/"), (2, 0, 0))
+        self.assertEqual(index.get_counts("smb://nas/music/"), (0, 0, 1))
+        self.assertEqual(listdir.call_count, 2)
+
+    @mock.patch("xbmcvfs.listdir", side_effect=_listdir)
+    def test_revalidate_by_mtime(self, listdir: mock.MagicMock):
+
+        index = self._build_index(ttl=60)
+        with mock.patch("xbmcvfs.Stat.st_mtime", return_value=1000), mock.patch("time.time", return_value=0):
+            index.listdir("smb://nas/music/")
+
+        # ttl is over but directory is unchanged
+        with mock.patch("xbmcvfs.Stat.st_mtime", return_value=1000), mock.patch("time.time", return_value=3601):
+            index.listdir("smb://nas/music/")
+
+        self.assertEqual(listdir.call_count, 1)
+
+        # directory has changed
+        with mock.patch("xbmcvfs.Stat.st_mtime", return_value=2000), mock.patch("time.time", return_value=7202):
+            index.listdir("smb://nas/music/")
+
+        self.assertEqual(listdir.call_count, 2)
+
+    @mock.patch("xbmcvfs.listdir", side_effect=_listdir)
+    def test_disabled(self, listdir: mock.MagicMock):
+
+        index = self._build_index(ttl=0)
+        index.listdir("smb://nas/music/")
+        index.listdir("smb://nas/music/")
+        self.assertEqual(listdir.call_count, 2)
+        self.assertIsNone(index.get_types("smb://nas/music/"))
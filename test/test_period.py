@@ -2095,3 +2095,19 @@ class TestPeriod(unittest.TestCase):
 
         s, e, b = timers[1].periods[0].hit(timers[0].periods[3].end, base)
         self.assertEqual(b, True)
+
+    def test_integer_seconds(self):
+
+        period = Period(timedelta(days=1, hours=2), timedelta(days=1, hours=3, seconds=5))
+        self.assertEqual(period.start_secs, 93600)
+        self.assertEqual(period.end_secs, 97205)
+        self.assertEqual(period.start, timedelta(days=1, hours=2))
+        self.assertEqual(type(period.end), timedelta)
+
+        period = Period(datetime(2024, 8, 19, 22, 0), datetime(2024, 8, 20, 1, 30))
+        self.assertEqual(period.end_secs - period.start_secs, 12600)
+        self.assertEqual(period.start, datetime(2024, 8, 19, 22, 0))
+        self.assertEqual(period.end, datetime(2024, 8, 20, 1, 30))
+
+        with self.assertRaises(AttributeError):
+            period.foo = 1
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from resources.lib.player.mediaindex import MediaIndex
+from resources.lib.utils import picture_utils, vfs_utils
+
+_TREE = {
+    "/p/": (["a", "b"], ["1.jpg"]),
+    "/p/a/": (["c"], ["%i.jpg" % i for i in range(10)]),
+    "/p/a/c/": ([], ["%i.jpg" % i for i in range(30)]),
+    "/p/b/": ([], ["1.jpg", "2.jpg", "info.txt"])
+}
+
+
+class TestPictureUtils(unittest.TestCase):
+
+    def setUp(self) -> None:
+
+        self._dir = tempfile.TemporaryDirectory()
+        picture_utils._scans.clear()
+        picture_utils._tables.clear()
+        vfs_utils._supported_media = None
+        MediaIndex._entries = None
+
+    def tearDown(self) -> None:
+
+        self._dir.cleanup()
+        MediaIndex._entries = None
+        MediaIndex._dirty = False
+
+    def test_alias_table(self):
+
+        table = picture_utils.AliasTable([1, 0, 3])
+        picks = [table.pick() for _ in range(4000)]
+
+        self.assertEqual(picks.count(1), 0)
+        self.assertAlmostEqual(picks.count(2) / picks.count(0), 3, delta=0.6)
+
+        self.assertIsNone(picture_utils.AliasTable([0, 0]).pick())
+        self.assertIsNone(picture_utils.AliasTable([]).pick())
+
+    @mock.patch("xbmc.getSupportedMedia", side_effect=lambda t: ".jpg|" if t == "picture" else ".mp3|")
+    @mock.patch("xbmcvfs.listdir", side_effect=lambda p: _TREE.get(p, ([], [])))
+    def test_get_good_matching_random_folder(self, listdir: mock.MagicMock, getSupportedMedia: mock.MagicMock):
+
+        self.assertEqual(picture_utils._scan_picture_counts("/p/"), [
+            ("/p/a/c/", 30), ("/p/a/", 40), ("/p/b/", 2), ("/p/", 43)])
+
+        picks = set()
+        for _ in range(200):
+            picks.add(picture_utils.get_good_matching_random_folder(
+                "/p/", wanted_amount=20))
+
+        # /p/b/ has less than half of the wanted amount
+        self.assertEqual(
+            picks, {("/p/a/c/", True), ("/p/a/", True), ("/p/", True)})
+
+        self.assertEqual(picture_utils.get_good_matching_random_folder(
+            "/p/b/", wanted_amount=20), ("/p/b/", False))
+
+    @mock.patch("xbmc.getSupportedMedia", side_effect=lambda t: ".jpg|" if t == "picture" else ".mp3|")
+    @mock.patch("xbmcvfs.listdir", side_effect=lambda p: _TREE.get(p, ([], [])))
+    def test_tables_of_rescanned_path_are_dropped(self, listdir: mock.MagicMock, getSupportedMedia: mock.MagicMock):
+
+        # without media index each call rescans, so only the latest table of a path is kept
+        picture_utils.get_good_matching_random_folder("/p/", 10)
+        picture_utils.get_good_matching_random_folder("/p/b/", 20)
+        picture_utils.get_good_matching_random_folder("/p/", 20)
+        self.assertEqual(sorted(picture_utils._tables), [
+                         ("/p/", 20), ("/p/b/", 20)])
+
+    @mock.patch("xbmcvfs.listdir", return_value=([], []))
+    def test_empty_folder(self, listdir: mock.MagicMock):
+
+        self.assertEqual(picture_utils.get_good_matching_random_folder(
+            "/empty/", wanted_amount=20), ("/empty/", True))
+
+    @mock.patch("xbmc.getSupportedMedia", side_effect=lambda t: ".jpg|" if t == "picture" else ".mp3|")
+    @mock.patch("xbmcvfs.listdir", side_effect=lambda p: _TREE.get(p, ([], [])))
+    def test_scan_is_cached(self, listdir: mock.MagicMock, getSupportedMedia: mock.MagicMock):
+
+        index_path = os.path.join(self._dir.name, "mediaindex.json")
+        with mock.patch("xbmcaddon.Addon.getSettingInt", return_value=60), \
+                mock.patch.object(MediaIndex, "_get_index_path", return_value=index_path):
+            picture_utils.get_good_matching_random_folder("/p/", 20)
+            calls = listdir.call_count
+            picture_utils.get_good_matching_random_folder("/p/", 20)
+            picture_utils.get_good_matching_random_folder("/p/", 10)
+
+        self.assertEqual(listdir.call_count, calls)
@@ -0,0 +1,192 @@
+import json
+import unittest
+from unittest import mock
+
+from resources.lib.player import player_utils
+from resources.lib.player.mediatype import AUDIO, VIDEO
+from resources.lib.test.mockplayer import MockPlayer
+
+_FILES = ["/music/%03i.mp3" % i for i in range(500)]
+
+
+def _execute(request: str) -> str:
+
+    def _respond(r: dict) -> dict:
+
+        if r["method"] == "Player.GetActivePlayers":
+            result = [{"type": AUDIO, "playerid": 0}]
+        elif r["method"] == "Player.GetProperties":
+            result = {"playlistid": 0, "position": 3, "repeat": "all"}
+        elif r["method"] == "Playlist.GetProperties":
+            result = {"size": len(_FILES)}
+        else:
+            limits = r["params"]["limits"]
+            result = {"items": [{"file": f}
+                                for f in _FILES[limits["start"]:limits["end"]]]}
+
+        return {"id": r["id"], "jsonrpc": "2.0", "result": result}
+
+    request = json.loads(request)
+    if type(request) == list:
+        return json.dumps([_respond(r) for r in request])
+
+    return json.dumps(_respond(request))
+
+
+def _fetch() -> 'dict[str, player_utils.State]':
+
+    states = dict()
+    for i, _type in enumerate([AUDIO, VIDEO]):
+        state = player_utils.State()
+        state.playerId = i
+        state.type = _type
+        state.position = 0
+        states[_type] = state
+
+    return states
+
+
+class TestPlayerUtils(unittest.TestCase):
+
+    def setUp(self) -> None:
+
+        player_utils.invalidate_player_states()
+
+    @mock.patch("resources.lib.player.player_utils._fetch_active_players_with_playlist", side_effect=_fetch)
+    def test_state_cache(self, fetch: mock.MagicMock):
+
+        self.assertEqual(
+            list(player_utils.get_active_players_with_playlist()), [AUDIO, VIDEO])
+        self.assertEqual(
+            list(player_utils.get_active_players_with_playlist(VIDEO)), [VIDEO])
+        self.assertEqual(
+            player_utils.get_active_players_with_playlist("picture"), dict())
+        self.assertEqual(fetch.call_count, 1)
+
+        player_utils.invalidate_player_states()
+        player_utils.get_active_players_with_playlist(AUDIO)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_state_cache_invalidated_while_fetching(self):
+
+        def _fetch_and_invalidate() -> 'dict[str, player_utils.State]':
+
+            # e.g. a Player callback in another thread
+            player_utils.invalidate_player_states()
+            return _fetch()
+
+        with mock.patch("resources.lib.player.player_utils._fetch_active_players_with_playlist", side_effect=_fetch_and_invalidate) as fetch:
+            self.assertEqual(
+                list(player_utils.get_active_players_with_playlist()), [AUDIO, VIDEO])
+            player_utils.get_active_players_with_playlist()
+            self.assertEqual(fetch.call_count, 2)
+
+    @mock.patch("resources.lib.player.player_utils._fetch_active_players_with_playlist", side_effect=_fetch)
+    def test_state_cache_returns_copies(self, fetch: mock.MagicMock):
+
+        state = player_utils.get_active_players_with_playlist(AUDIO)[AUDIO]
+        state.position = 5
+
+        self.assertEqual(player_utils.get_active_players_with_playlist(
+            AUDIO)[AUDIO].position, 0)
+
+    @mock.patch("resources.lib.player.player_utils._fetch_active_players_with_playlist", side_effect=_fetch)
+    @mock.patch("time.monotonic")
+    def test_state_cache_expires(self, monotonic: mock.MagicMock, fetch: mock.MagicMock):
+
+        monotonic.return_value = 100.0
+        player_utils.get_active_players_with_playlist()
+
+        monotonic.return_value = 100.5
+        player_utils.get_active_players_with_playlist()
+        self.assertEqual(fetch.call_count, 1)
+
+        monotonic.return_value = 102.0
+        player_utils.get_active_players_with_playlist()
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_fingerprint(self):
+
+        fingerprint = player_utils.PlaylistFingerprint(_FILES)
+        self.assertEqual(fingerprint, player_utils.PlaylistFingerprint(list(_FILES)))
+        self.assertNotEqual(fingerprint, player_utils.PlaylistFingerprint(_FILES[:-1]))
+        self.assertNotEqual(fingerprint, player_utils.PlaylistFingerprint(
+            _FILES[:1] + _FILES[2:3] + _FILES[1:2] + _FILES[3:]))
+
+        self.assertTrue(fingerprint.matches_bounds(
+            (500, "/music/000.mp3", "/music/499.mp3", "off")))
+        self.assertFalse(fingerprint.matches_bounds(
+            (500, "/music/001.mp3", "/music/499.mp3", "off")))
+
+    @mock.patch("xbmc.executeJSONRPC", side_effect=_execute)
+    def test_active_playlist_bounds(self, executeJSONRPC: mock.MagicMock):
+
+        self.assertEqual(player_utils.get_active_playlist_bounds(AUDIO),
+                         (500, "/music/000.mp3", "/music/499.mp3", "all"))
+        self.assertIsNone(player_utils.get_active_playlist_bounds(VIDEO))
+
+        # two batches for an active playlist, one for an inactive one
+        self.assertEqual(executeJSONRPC.call_count, 3)
+
+    def test_is_playing_by_fingerprint(self):
+
+        player = MockPlayer()
+        playlist = player._buildPlaylist(_FILES, type=AUDIO)
+        player._setFingerprint(AUDIO, _FILES, playlist)
+        player.play(playlist)
+        player.setRepeat(player_utils.REPEAT_ALL)
+
+        with mock.patch.object(player, "getActivePlayersWithPlaylist") as getActivePlayersWithPlaylist:
+            self.assertTrue(player._isPlaying(
+                list(_FILES), AUDIO, repeat=player_utils.REPEAT_ALL))
+            self.assertFalse(player._isPlaying(
+                list(_FILES), AUDIO, repeat=player_utils.REPEAT_OFF))
+            self.assertFalse(player._isPlaying(
+                _FILES[:10], AUDIO, repeat=player_utils.REPEAT_ALL))
+            getActivePlayersWithPlaylist.assert_not_called()
+
+        # playlist has been replaced by someone else, so compare all items
+        player.play(player._buildPlaylist(_FILES[1:], type=AUDIO))
+        self.assertFalse(player._isPlaying(
+            _FILES, AUDIO, repeat=player_utils.REPEAT_ALL))
+        self.assertTrue(player._isPlaying(
+            _FILES[1:], AUDIO, repeat=player_utils.REPEAT_ALL))
+
+    def test_seek_position(self):
+
+        durations = [600.0, 300.0, 900.0]
+        self.assertEqual(player_utils.get_seek_position(
+            durations, start=0, seektime=700, repeat_all=False), (1, 100))
+        self.assertEqual(player_utils.get_seek_position(
+            durations, start=1, seektime=300, repeat_all=False), (2, 0))
+        self.assertIsNone(player_utils.get_seek_position(
+            durations, start=1, seektime=1200, repeat_all=False))
+        self.assertEqual(player_utils.get_seek_position(
+            durations, start=1, seektime=1200 + 1800 * 3 + 650, repeat_all=True), (1, 50))
+
+    def test_seek_by_probing(self):
+
+        player = MockPlayer()
+        player.__is_unit_test__ = True
+        playlist = player._buildPlaylist(
+            ["Media 1 (0:10)", "Media 2 (0:05)", "Media 3 (0:15)"], VIDEO)
+        player.play(playlist)
+        player.setRepeat(player_utils.REPEAT_ALL)
+
+        # durations are unknown to library, so items are played one by one
+        with mock.patch.object(player, "_getPlaylistDurations", return_value=list()):
+            player._playAV(playlist, seektime=(30 * 3 + 10) * 60,
+                           repeat=player_utils.REPEAT_ALL)
+
+        state = player.getActivePlayersWithPlaylist()[VIDEO]
+        self.assertEqual(state.position, 1)
+        self.assertEqual(state.time, 0)
+        self.assertEqual(player._seektime, None)
+
+        with mock.patch.object(player, "_getPlaylistDurations", return_value=list()):
+            player._playAV(playlist, seektime=(10 + 5 + 15 + 2) * 60,
+                           repeat=player_utils.REPEAT_ALL)
+
+        state = player.getActivePlayersWithPlaylist()[VIDEO]
+        self.assertEqual(state.position, 0)
+        self.assertEqual(state.time, 120)
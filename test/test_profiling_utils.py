@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from resources.lib.utils import profiling_utils
+
+
+@profiling_utils.profiled("test.double")
+def _double(x: int) -> int:
+
+    return x * 2
+
+
+class TestProfilingUtils(unittest.TestCase):
+
+    def tearDown(self) -> None:
+
+        profiling_utils.set_enabled(False)
+        profiling_utils.reset()
+
+    def test_disabled(self):
+
+        self.assertEqual(_double(2), 4)
+        profiling_utils.count("test.counter")
+        with profiling_utils.measure("test.measure"):
+            pass
+
+        stats = profiling_utils.get_stats()
+        self.assertEqual(stats["timings"], {})
+        self.assertEqual(stats["counters"], {})
+
+    def test_enabled(self):
+
+        profiling_utils.set_enabled(True)
+        self.assertEqual(_double(2), 4)
+        _double(3)
+        profiling_utils.count("test.counter")
+        profiling_utils.count("test.counter", 2)
+        profiling_utils.record("test.slow", 0.2)
+
+        stats = profiling_utils.get_stats()
+        self.assertEqual(stats["timings"]["test.double"]["count"], 2)
+        self.assertEqual(stats["timings"]["test.slow"]["histogram"], {
+                         "<=500ms": 1})
+        self.assertEqual(stats["timings"]["test.slow"]["max_ms"], 200.0)
+        self.assertEqual(stats["counters"], {"test.counter": 3})
+
+    def test_dump(self):
+
+        profiling_utils.set_enabled(True)
+        _double(1)
+        with tempfile.TemporaryDirectory() as dir:
+            dump_path = os.path.join(dir, "profiling.json")
+            with mock.patch.object(profiling_utils, "_get_dump_path", return_value=dump_path):
+                profiling_utils.dump_if_due()
+                self.assertFalse(os.path.exists(dump_path))
+
+                profiling_utils.dump()
+                with open(dump_path, "r", encoding="utf-8") as file:
+                    stats = json.load(file)
+
+        self.assertEqual(stats["timings"]["test.double"]["count"], 1)
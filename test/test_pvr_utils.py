@@ -0,0 +1,69 @@
+import json
+import unittest
+from unittest import mock
+
+from resources.lib.contextmenu import pvr_utils
+
+_RESULTS = {
+    "PVR.GetChannelGroups": {"channelgroups": [{"channelgroupid": 1, "label": "All channels"}]},
+    "PVR.GetClients": {"clients": [{"clientid": 1, "addonid": "pvr.iptv", "instanceid": 1, "supportsepg": True},
+                                   {"clientid": 2, "addonid": "pvr.noepg", "instanceid": 1, "supportsepg": False}]},
+    "PVR.GetChannels": {"channels": [{"channelnumber": n, "uniqueid": 1000 + n, "clientid": 1 if n < 900 else 2}
+                                     for n in range(1, 1001)]}
+}
+
+
+def _execute(request: str) -> str:
+
+    def _respond(r: dict) -> dict:
+        return {"id": r["id"], "jsonrpc": "2.0", "result": _RESULTS[r["method"]]}
+
+    request = json.loads(request)
+    if type(request) == list:
+        return json.dumps([_respond(r) for r in request])
+
+    return json.dumps(_respond(request))
+
+
+class TestPvrUtils(unittest.TestCase):
+
+    def setUp(self) -> None:
+
+        pvr_utils._channel_index.clear()
+
+    @mock.patch("xbmc.getInfoLabel", return_value="20.2 (20.2.0) Git:20230629-5f418d0b13")
+    @mock.patch("xbmc.executeJSONRPC", side_effect=_execute)
+    def test_get_pvr_channel_path(self, executeJSONRPC: mock.MagicMock, getInfoLabel: mock.MagicMock):
+
+        self.assertEqual(pvr_utils.get_pvr_channel_path(pvr_utils.PVR_TV, "5"),
+                         "pvr://channels/tv/All%20channels/pvr.iptv_1005.pvr")
+        self.assertEqual(executeJSONRPC.call_count, 2)
+
+        # index is reused as long as channel groups are unchanged
+        self.assertEqual(pvr_utils.get_pvr_channel_path(pvr_utils.PVR_TV, "7"),
+                         "pvr://channels/tv/All%20channels/pvr.iptv_1007.pvr")
+        self.assertIsNone(
+            pvr_utils.get_pvr_channel_path(pvr_utils.PVR_TV, "950"))
+        self.assertIsNone(
+            pvr_utils.get_pvr_channel_path(pvr_utils.PVR_TV, "2000"))
+        self.assertIsNone(
+            pvr_utils.get_pvr_channel_path(pvr_utils.PVR_TV, "abc"))
+        self.assertEqual(executeJSONRPC.call_count, 5)
+
+    @mock.patch("xbmc.getInfoLabel", return_value="21.0-BETA1 (20.90.101) Git:20231002-4d6d4a2b4e")
+    @mock.patch("xbmc.executeJSONRPC", side_effect=_execute)
+    def test_refresh_on_changed_groups(self, executeJSONRPC: mock.MagicMock, getInfoLabel: mock.MagicMock):
+
+        self.assertEqual(pvr_utils.get_pvr_channel_path(pvr_utils.PVR_RADIO, "1"),
+                         "pvr://channels/radio/All%20channels@-1/1@pvr.iptv_1001.pvr")
+
+        _groups = _RESULTS["PVR.GetChannelGroups"]
+        _RESULTS["PVR.GetChannelGroups"] = {"channelgroups": [
+            {"channelgroupid": 1, "label": "Alle Kanäle"}]}
+        try:
+            self.assertEqual(pvr_utils.get_pvr_channel_path(pvr_utils.PVR_RADIO, "1"),
+                             "pvr://channels/radio/Alle%20Kan%C3%A4le@-1/1@pvr.iptv_1001.pvr")
+        finally:
+            _RESULTS["PVR.GetChannelGroups"] = _groups
+
+        self.assertEqual(executeJSONRPC.call_count, 4)
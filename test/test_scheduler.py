@@ -0,0 +1,40 @@
+import threading
+import time
+import unittest
+
+from resources.lib.timer.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+
+    def _build_scheduler(self, abort: threading.Event) -> Scheduler:
+
+        # only the waits of the scheduler are needed, not its Kodi services
+        scheduler = Scheduler.__new__(Scheduler)
+        scheduler._wakeup = threading.Event()
+        scheduler.waitForAbort = lambda timeout=-1: abort.wait()
+        scheduler.abortRequested = abort.is_set
+        threading.Thread(target=scheduler._wakeup_on_abort,
+                         daemon=True).start()
+        return scheduler
+
+    def test_abort_ends_wait(self):
+
+        abort = threading.Event()
+        scheduler = self._build_scheduler(abort)
+        threading.Timer(0.1, abort.set).start()
+
+        t0 = time.monotonic()
+        self.assertTrue(scheduler._wait_for_event(60))
+        self.assertLess(time.monotonic() - t0, 10)
+
+    def test_wakeup_ends_wait(self):
+
+        abort = threading.Event()
+        scheduler = self._build_scheduler(abort)
+        threading.Timer(0.1, scheduler.wakeup).start()
+
+        t0 = time.monotonic()
+        self.assertFalse(scheduler._wait_for_event(60))
+        self.assertLess(time.monotonic() - t0, 10)
+        abort.set()
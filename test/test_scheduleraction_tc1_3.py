@@ -65,7 +65,6 @@ class TestSchedulerActions_1_3(unittest.TestCase):
         timer1.vol_min = 40
         timer1.vol_max = None
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t3))]
@@ -58,7 +58,6 @@ class TestSchedulerActions_2_1(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t5))]
@@ -77,7 +76,6 @@ class TestSchedulerActions_2_1(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t7))]
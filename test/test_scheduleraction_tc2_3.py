@@ -60,7 +60,6 @@ class TestSchedulerActions_2_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t5))]
@@ -79,7 +78,6 @@ class TestSchedulerActions_2_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t7))]
@@ -350,7 +348,6 @@ class TestSchedulerActions_2_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t5))]
@@ -369,7 +366,6 @@ class TestSchedulerActions_2_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t7))]
@@ -646,7 +642,6 @@ class TestSchedulerActions_2_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t5))]
@@ -665,7 +660,6 @@ class TestSchedulerActions_2_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t7))]
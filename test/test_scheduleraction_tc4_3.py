@@ -65,7 +65,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer1.vol_min = 20
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t7))]
@@ -84,7 +83,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t5))]
@@ -350,7 +348,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t7))]
@@ -370,7 +367,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t5))]
@@ -543,10 +539,10 @@ class TestSchedulerActions_4_3(unittest.TestCase):
 
         apwpl = player.getActivePlayersWithPlaylist()
         self.assertEqual(VIDEO in apwpl, True)
-        self.assertEqual(apwpl[VIDEO].position, 1)
-        self.assertEqual(apwpl[VIDEO].time, 1320)
-        self.assertEqual(apwpl[VIDEO].playlist[1]
-                         ["file"], timers[0].path.split("|")[1])
+        self.assertEqual(apwpl[VIDEO].position, 0)
+        self.assertEqual(apwpl[VIDEO].time, 2040)
+        self.assertEqual(apwpl[VIDEO].playlist[0]
+                         ["file"], timers[0].path.split("|")[0])
         self.assertEqual(player.getVolume(), 100)
         self.assertEqual(player._getResumeStatus(VIDEO), None)
         self.assertEqual(apwpl[VIDEO].shuffled, False)
@@ -670,7 +666,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t7))]
@@ -689,7 +684,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t5))]
@@ -952,7 +946,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t7))]
@@ -971,7 +964,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t5))]
@@ -1231,7 +1223,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t7))]
@@ -1250,7 +1241,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t5))]
@@ -1521,7 +1511,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t5))]
@@ -1540,7 +1529,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t7))]
@@ -1559,7 +1547,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer3.vol_min = 0
         timer3.vol_max = 100
         timer3.system_action = SYSTEM_ACTION_NONE
-        timer3.active = False
         timer3.notify = False
         timer3.periods = [
             Period(timedelta(days=3, minutes=self._t5), timedelta(days=3, minutes=self._t7))]
@@ -1830,7 +1817,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer1.vol_min = 0
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t5))]
@@ -1849,7 +1835,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer2.vol_min = 0
         timer2.vol_max = 100
         timer2.system_action = SYSTEM_ACTION_NONE
-        timer2.active = False
         timer2.notify = False
         timer2.periods = [
             Period(timedelta(days=3, minutes=self._t3), timedelta(days=3, minutes=self._t7))]
@@ -1868,7 +1853,6 @@ class TestSchedulerActions_4_3(unittest.TestCase):
         timer3.vol_min = 0
         timer3.vol_max = 100
         timer3.system_action = SYSTEM_ACTION_NONE
-        timer3.active = False
         timer3.notify = False
         timer3.periods = [
             Period(timedelta(days=3, minutes=self._t5), timedelta(days=3, minutes=self._t7))]
@@ -64,7 +64,6 @@ class TestSchedulerActions_5_1_1(unittest.TestCase):
         timer1.vol_min = 50
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t3))]
@@ -266,7 +265,6 @@ class TestSchedulerActions_5_1_2(unittest.TestCase):
         timer1.vol_min = 50
         timer1.vol_max = 100
         timer1.system_action = SYSTEM_ACTION_NONE
-        timer1.active = False
         timer1.notify = False
         timer1.periods = [
             Period(timedelta(days=3, minutes=self._t1), timedelta(days=3, minutes=self._t3))]
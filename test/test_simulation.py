@@ -0,0 +1,47 @@
+import unittest
+from datetime import timedelta
+
+from resources.lib.test.simulation import (SIMULATION_START, Simulation,
+                                           SimulationClock, generate_timers)
+from resources.lib.timer.concurrency import determine_overlappings
+from resources.lib.timer.timer import SYSTEM_ACTION_NONE
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_clock(self):
+
+        clock = SimulationClock()
+        clock.advance(90)
+        self.assertEqual(clock.now().dt, SIMULATION_START +
+                         timedelta(seconds=90))
+        self.assertEqual(clock.now().td, timedelta(minutes=1, seconds=30))
+
+    def test_generate_timers(self):
+
+        timers = generate_timers(50, overlap=0.5, system_ratio=0.2, seed=1)
+        self.assertEqual(len(timers), 50)
+        self.assertEqual([t.start for t in timers], [
+                         t.start for t in generate_timers(50, overlap=0.5, system_ratio=0.2, seed=1)])
+        self.assertTrue(all(t.periods for t in timers))
+        self.assertTrue(
+            any(t.system_action != SYSTEM_ACTION_NONE for t in timers))
+
+        overlapping = [t for t in timers if determine_overlappings(
+            t, timers, base=SIMULATION_START)]
+        self.assertTrue(overlapping)
+
+    def test_run(self):
+
+        reports = list()
+        for event_driven in [False, True]:
+            timers = generate_timers(30, seed=2)
+            simulation = Simulation(timers, event_driven=event_driven)
+            reports.append(simulation.run(timedelta(days=2)))
+
+        # both modes handle the same events but event driven mode needs less ticks
+        self.assertTrue(reports[0].events > 0)
+        self.assertEqual(reports[0].events, reports[1].events)
+        self.assertTrue(reports[0].ticks > reports[1].ticks)
+        self.assertEqual(len(reports[0].perform_secs), reports[0].ticks)
+        self.assertIn("calculate", str(reports[0]))
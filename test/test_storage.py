@@ -0,0 +1,195 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from resources.lib.timer import storage as storage_module
+from resources.lib.timer.storage import Storage
+from resources.lib.timer.timer import END_TYPE_TIME, TIMER_WEEKLY, Timer
+
+
+def _build_timer(id: int, label="") -> Timer:
+
+    timer = Timer(id)
+    timer.label = label or "Timer %i" % id
+    timer.days = [0, 1, TIMER_WEEKLY]
+    timer.start = "08:00"
+    timer.end_type = END_TYPE_TIME
+    timer.end = "10:00"
+    timer.init()
+    return timer
+
+
+def _rename(src: str, dst: str) -> bool:
+
+    try:
+        os.replace(src, dst)
+        return True
+
+    except OSError:
+        return False
+
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self) -> None:
+
+        # stubs of xbmcvfs don't touch the file system
+        self._dir = tempfile.TemporaryDirectory()
+        self._storage_path = os.path.join(self._dir.name, "timers.json")
+        self._journal_path = "%s.journal" % self._storage_path
+        self._patches = [
+            mock.patch.object(Storage, "_storage_path", self._storage_path),
+            mock.patch("xbmcvfs.exists", side_effect=os.path.exists),
+            mock.patch("xbmcvfs.File", side_effect=lambda path,
+                       mode: open(path, mode, encoding="utf-8")),
+            mock.patch("xbmcvfs.rename", side_effect=_rename),
+            mock.patch("xbmcvfs.delete", side_effect=os.remove)
+        ]
+        for patch in self._patches:
+            patch.start()
+
+        Storage()._invalidate_cache()
+
+    def tearDown(self) -> None:
+
+        Storage()._invalidate_cache()
+        for patch in self._patches:
+            patch.stop()
+
+        self._dir.cleanup()
+
+    def _read_journal(self) -> 'list[dict]':
+
+        with open(self._journal_path, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_journal_replay_order(self):
+
+        storage = Storage()
+        storage.save_timer(_build_timer(2, "first"))
+        storage.save_timer(_build_timer(1))
+        storage.save_timer(_build_timer(2, "second"))
+
+        self.assertEqual(len(self._read_journal()), 3)
+        self.assertFalse(os.path.exists(self._storage_path))
+
+        # later entries win, timers are sorted by id
+        storage._invalidate_cache()
+        timers = Storage().load_timers_from_storage()
+        self.assertEqual([(t.id, t.label) for t in timers],
+                         [(1, "Timer 1"), (2, "second")])
+
+    def test_delete_after_save(self):
+
+        storage = Storage()
+        storage.save_timer(_build_timer(1))
+        storage.save_timer(_build_timer(2))
+        storage.delete_timer(1)
+        storage.delete_timer(3)
+
+        storage._invalidate_cache()
+        self.assertEqual(
+            [t.id for t in storage.load_timers_from_storage()], [2])
+
+        storage.save_timer(_build_timer(1, "again"))
+        storage._invalidate_cache()
+        self.assertEqual([(t.id, t.label) for t in storage.load_timers_from_storage()],
+                         [(1, "again"), (2, "Timer 2")])
+
+    def test_truncated_last_line_is_skipped(self):
+
+        storage = Storage()
+        storage.save_timer(_build_timer(1))
+        storage.save_timer(_build_timer(2))
+
+        # Kodi has crashed while writing the last entry
+        with open(self._journal_path, "a", encoding="utf-8") as file:
+            file.write('{"item": {"id": 3, "label": "Tim')
+
+        self.assertEqual(
+            [t.id for t in Storage().load_timers_from_storage()], [1, 2])
+
+    def test_compaction(self):
+
+        storage = Storage()
+        storage.save_timer(_build_timer(1))
+        with mock.patch.object(storage_module, "_JOURNAL_MAX_SIZE", 1):
+            storage.save_timer(_build_timer(2))
+
+        # journal has been folded into storage file
+        self.assertFalse(os.path.exists(self._journal_path))
+        with open(self._storage_path, "r", encoding="utf-8") as file:
+            self.assertEqual([item["id"] for item in json.load(file)], [1, 2])
+
+        self.assertEqual(
+            [t.id for t in Storage().load_timers_from_storage()], [1, 2])
+
+    def test_replace_storage_discards_journal(self):
+
+        storage = Storage()
+        storage.save_timer(_build_timer(1))
+        storage.save_timer(_build_timer(2))
+        storage.replace_storage([_build_timer(3)])
+
+        self.assertFalse(os.path.exists(self._journal_path))
+        self.assertEqual(
+            [t.id for t in Storage().load_timers_from_storage()], [3])
+
+    def test_cache_hit_on_unchanged_files(self):
+
+        storage = Storage()
+        storage.save_timer(_build_timer(1))
+        storage.save_timer(_build_timer(2))
+        storage._invalidate_cache()
+
+        with mock.patch.object(Storage, "_load_from_storage", autospec=True,
+                               side_effect=Storage._load_from_storage) as load:
+            Storage().load_timers_from_storage()
+            Storage().load_timers_from_storage()
+            self.assertEqual(load.call_count, 1)
+
+            # own writes keep the cache valid
+            storage.save_timer(_build_timer(3))
+            self.assertEqual(
+                [t.id for t in Storage().load_timers_from_storage()], [1, 2, 3])
+            self.assertEqual(load.call_count, 1)
+
+    def test_cache_returns_copies(self):
+
+        storage = Storage()
+        storage.save_timer(_build_timer(1))
+
+        timer = storage.load_timers_from_storage()[0]
+        timer.label = "changed"
+        timer.days.append(2)
+        timer.periods.clear()
+
+        timer = storage.load_timers_from_storage()[0]
+        self.assertEqual(timer.label, "Timer 1")
+        self.assertEqual(timer.days, [0, 1, TIMER_WEEKLY])
+        self.assertEqual(len(timer.periods), 2)
+
+    def test_cache_invalidated_by_other_writers(self):
+
+        storage = Storage()
+        storage.save_timer(_build_timer(1))
+        storage.replace_storage([_build_timer(1), _build_timer(2)])
+        self.assertEqual(
+            [t.id for t in storage.load_timers_from_storage()], [1, 2])
+
+        # another process appends to the journal
+        with open(self._journal_path, "a", encoding="utf-8") as file:
+            file.write("%s\n" % json.dumps({"op": "delete", "id": 1}))
+
+        self.assertEqual(
+            [t.id for t in storage.load_timers_from_storage()], [2])
+
+        # another process rewrites the storage file
+        with open(self._storage_path, "w", encoding="utf-8") as file:
+            json.dump([_build_timer(5).to_dict()], file)
+
+        os.remove(self._journal_path)
+        self.assertEqual(
+            [t.id for t in storage.load_timers_from_storage()], [5])
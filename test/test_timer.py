@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta
+
+from resources.lib.timer.timer import (END_TYPE_DURATION, END_TYPE_NO,
+                                       END_TYPE_TIME, TIMER_BY_DATE,
+                                       TIMER_WEEKLY, Timer)
+
+
+class TestTimer(unittest.TestCase):
+
+    def test_init_weekdays_by_duration(self):
+
+        timer = Timer(1)
+        timer.days = [0, 2, TIMER_WEEKLY]
+        timer.start = "23:30"
+        timer.end_type = END_TYPE_DURATION
+        timer.duration = "01:00"
+        timer.duration_offset = 10
+        timer.init()
+
+        self.assertEqual([(p.start, p.end) for p in timer.periods], [
+            (timedelta(days=0, hours=23, minutes=30), timedelta(days=1, minutes=30, seconds=10)),
+            (timedelta(days=2, hours=23, minutes=30), timedelta(days=3, minutes=30, seconds=10))])
+        self.assertEqual(timer.end, "00:30")
+        self.assertEqual(timer.end_offset, 10)
+        self.assertEqual(timer.duration_timedelta,
+                         timedelta(hours=1, seconds=10))
+
+    def test_init_by_date_with_end_time(self):
+
+        timer = Timer(1)
+        timer.set_timer_by_date("2024-08-19")
+        timer.start = "23:00"
+        timer.end_type = END_TYPE_TIME
+        timer.end = "01:00"
+        timer.init()
+
+        self.assertEqual(timer.days, [TIMER_BY_DATE])
+        self.assertEqual(timer.periods[0].start, datetime(2024, 8, 19, 23, 0))
+        self.assertEqual(timer.periods[0].end, datetime(2024, 8, 20, 1, 0))
+        self.assertEqual(timer.duration, "02:00")
+
+    def test_init_is_idempotent(self):
+
+        timer = Timer(1)
+        timer.days = [1, 3]
+        timer.start = "10:00"
+        timer.start_offset = 90
+        timer.end_type = END_TYPE_NO
+        timer.init()
+        periods = [(p.start, p.end) for p in timer.periods]
+
+        timer.init()
+        self.assertEqual([(p.start, p.end) for p in timer.periods], periods)
+        self.assertEqual(timer.start, "10:01")
+        self.assertEqual(timer.start_offset, 30)
+
+    def test_periods_are_shared(self):
+
+        timer1 = Timer(1)
+        timer1.days = [0, 1]
+        timer1.start = "08:00"
+        timer1.init()
+
+        timer2 = Timer(2)
+        timer2.days = [1, 4]
+        timer2.start = "08:00"
+        timer2.init()
+
+        self.assertIs(timer1.periods[1], timer2.periods[0])
@@ -1,11 +1,51 @@
 import os
+import threading
+import time
 import unittest
+from unittest import mock
 
 from resources.lib.utils import vfs_utils
 
+_TREE = {
+    "/media/": (["a", "b"], ["info.nfo", "cover.jpg"]),
+    "/media/a/": ([], ["1.mp3", "2.mp3", "3.mkv"]),
+    "/media/b/": ([], ["4.mp3"])
+}
+
+_SUPPORTED_MEDIA = {
+    "music": ".mp3|",
+    "video": ".mkv|",
+    "picture": ".jpg|"
+}
+
+
+class _PlayList():
+
+    def __init__(self, playList: int) -> None:
+        self.playListId = playList
+        self.urls: 'list[str]' = list()
+        self.directUrl: str = None
+        self.pending: 'list[str]' = list()
+
+    def getPlayListId(self) -> int:
+
+        return self.playListId
+
+    def add(self, url: str, listitem=None) -> None:
+
+        self.urls.append(url)
+
+    def clear(self) -> None:
+
+        self.urls.clear()
+
 
 class TestVfsUtils(unittest.TestCase):
 
+    def setUp(self) -> None:
+
+        vfs_utils._supported_media = None
+
     def test_is_playlist(self):
 
         self.assertEqual(vfs_utils.is_playlist("/a/b/c/file.mp3"), False)
@@ -61,9 +101,31 @@ class TestVfsUtils(unittest.TestCase):
 
         pass
 
-    def test_get_media_type(self):
+    @mock.patch("xbmc.getInfoLabel", return_value="21.0")
+    @mock.patch("xbmc.getSupportedMedia", side_effect=lambda t: _SUPPORTED_MEDIA[t])
+    def test_get_media_type(self, getSupportedMedia: mock.MagicMock, getInfoLabel: mock.MagicMock):
 
-        pass
+        self.assertEqual(vfs_utils.get_media_type("/a/b.MP3"), "audio")
+        self.assertEqual(vfs_utils.get_media_type("/a/b.mkv"), "video")
+        self.assertEqual(vfs_utils.get_media_type("/a/b.jpg"), "picture")
+        self.assertEqual(vfs_utils.get_media_type(
+            "musicdb://a/b/c.mkv"), "audio")
+        self.assertEqual(vfs_utils.get_media_type(
+            "pvr://channels/tv/madtv.pvr"), "video")
+
+        # extensions are matched exactly, not as substring
+        with mock.patch("xbmcvfs.listdir", return_value=([], [])):
+            self.assertEqual(vfs_utils.get_media_type("/a/b.p3"), None)
+
+        self.assertEqual(getSupportedMedia.call_count, 3)
+
+        # refresh after Kodi has been updated
+        vfs_utils._refresh_supported_media()
+        self.assertEqual(getSupportedMedia.call_count, 3)
+
+        getInfoLabel.return_value = "22.0"
+        vfs_utils._refresh_supported_media()
+        self.assertEqual(getSupportedMedia.call_count, 6)
 
     def test_build_path_to_ressource(self):
 
@@ -137,3 +199,123 @@ class TestVfsUtils(unittest.TestCase):
         self.assertEqual(vfs_utils.get_file_name("media.mp3"), "media")
         self.assertEqual(vfs_utils.get_file_name("media"), "media")
         self.assertEqual(vfs_utils.get_file_name("script://path.ext/"), None)
+
+    @mock.patch("xbmc.getSupportedMedia", side_effect=lambda t: _SUPPORTED_MEDIA[t])
+    @mock.patch("xbmcvfs.listdir", side_effect=lambda p: _TREE.get(p, ([], [])))
+    def test_get_files_and_type(self, listdir: mock.MagicMock, getSupportedMedia: mock.MagicMock):
+
+        self.assertEqual(vfs_utils.get_files_and_type("/media/"),
+                         (["/media/a/1.mp3", "/media/a/2.mp3", "/media/b/4.mp3"], "audio"))
+
+        # single pass, info.nfo is a file of a listing and is not probed as a folder
+        self.assertEqual(listdir.call_count, 3)
+
+        self.assertEqual(vfs_utils.get_files_and_type("/media/info.nfo"),
+                         (["/media/info.nfo"], None))
+
+    @mock.patch("xbmc.getSupportedMedia", side_effect=lambda t: _SUPPORTED_MEDIA[t])
+    @mock.patch("xbmcvfs.listdir", side_effect=lambda p: _TREE.get(p, ([], [])))
+    def test_unknown_files_are_not_walked(self, listdir: mock.MagicMock, getSupportedMedia: mock.MagicMock):
+
+        with mock.patch.object(vfs_utils.MediaIndex, "save") as save:
+            self.assertEqual(vfs_utils.scan_item_paths("/media/"), [
+                "/media/a/1.mp3", "/media/a/2.mp3", "/media/a/3.mkv", "/media/b/4.mp3", "/media/cover.jpg"])
+
+        # only folders are listed and the media index is saved once
+        self.assertEqual(sorted(c.args[0] for c in listdir.call_args_list), [
+                         "/media/", "/media/a/", "/media/b/"])
+        save.assert_called_once()
+
+    @mock.patch("xbmc.getSupportedMedia", side_effect=lambda t: _SUPPORTED_MEDIA[t])
+    @mock.patch("xbmcvfs.listdir", side_effect=lambda p: _TREE.get(p, ([], [])))
+    def test_scan_stops_early(self, listdir: mock.MagicMock, getSupportedMedia: mock.MagicMock):
+
+        self.assertEqual(vfs_utils.has_items_in_path("/media/"), True)
+        self.assertEqual(listdir.call_count, 2)
+
+        self.assertEqual(vfs_utils.get_items_group_by_mediatype("/media/", limit=2),
+                         (["/media/a/1.mp3", "/media/a/2.mp3"], [], []))
+
+        self.assertEqual(
+            vfs_utils._get_dominant_media_type("/media/", limit=3), "audio")
+
+    def _build_deep_tree(self) -> 'dict[str, tuple[list[str], list[str]]]':
+
+        tree = dict()
+        for i in range(4):
+            tree["/p/%i/" % i] = (["x", "y"], ["%i.jpg" % i])
+            tree["/p/%i/x/" % i] = ([], ["a.jpg", "b.jpg"])
+            tree["/p/%i/y/" % i] = ([], ["c.jpg"])
+
+        tree["/p/"] = (["0", "1", "2", "3"], ["root.jpg"])
+        return tree
+
+    def test_walk_folders_parallel(self):
+
+        tree = self._build_deep_tree()
+        running = [0, 0]
+        guard = threading.Lock()
+
+        def _listdir(path: str) -> 'tuple[list[str], list[str]]':
+            with guard:
+                running[0] += 1
+                running[1] = max(running)
+
+            time.sleep(0.01)
+            with guard:
+                running[0] -= 1
+
+            return tree.get(path, ([], []))
+
+        with mock.patch("xbmcaddon.Addon.getSettingInt", return_value=1):
+            sequential = list(vfs_utils.walk_folders("/p/", listdir=_listdir))
+
+        self.assertEqual(running[1], 1)
+
+        with mock.patch("xbmcaddon.Addon.getSettingInt", return_value=4):
+            parallel = list(vfs_utils.walk_folders("/p/", listdir=_listdir))
+
+        self.assertGreater(running[1], 1)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual([f for f, s, _ in sequential][:3],
+                         ["/p/0/x/", "/p/0/y/", "/p/0/"])
+        self.assertEqual(sequential[-1], ("/p/", ["/p/0/", "/p/1/", "/p/2/", "/p/3/"], ["root.jpg"]))
+
+    def test_walk_folders_stop_early(self):
+
+        tree = self._build_deep_tree()
+        with mock.patch("xbmcaddon.Addon.getSettingInt", return_value=4):
+            walker = vfs_utils.walk_folders(
+                "/p/", listdir=lambda p: tree.get(p, ([], [])))
+            self.assertEqual(next(walker)[0], "/p/0/x/")
+            walker.close()
+
+    @mock.patch.object(vfs_utils, "_PLAYLIST_BATCH_SIZE", 2)
+    @mock.patch.object(vfs_utils, "_PLAYLIST_FIRST_ITEMS", 2)
+    @mock.patch.object(vfs_utils, "PlayList", _PlayList)
+    def test_progressive_playlist(self):
+
+        paths = ["/media/%i.mp3" % i for i in range(5)]
+        self.assertEqual(vfs_utils.convert_to_playlist(
+            paths, type="audio").urls, paths)
+
+        playlist = vfs_utils.convert_to_playlist(
+            paths, type="audio", progressive=True)
+        self.assertEqual(playlist.urls, paths[:2])
+        vfs_utils.fill_playlist(playlist)
+        self.assertEqual(playlist.urls, paths)
+        self.assertEqual(playlist.pending, [])
+
+        # filling stops once the playlist has been rebuilt
+        playlist = vfs_utils.convert_to_playlist(
+            paths, type="audio", progressive=True)
+        add = playlist.add
+
+        def _add_and_rebuild(url: str, listitem=None) -> None:
+            add(url, listitem)
+            vfs_utils.convert_to_playlist(["/other.mp3"], type="audio")
+
+        playlist.add = _add_and_rebuild
+        vfs_utils.fill_playlist(playlist)
+
+        self.assertEqual(playlist.urls, paths[:4])